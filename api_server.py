@@ -0,0 +1,317 @@
+"""
+JSON API for partner sites and the mobile app
+Serves the utils analytics and data_loader datasets over a small asyncio
+HTTP/1.1 server. Scoring runs in a process pool, responses are cached per
+dataset version and parameters with ETags, and bodies are gzip-compressed.
+
+Run with: python api_server.py [--port 8502] [--workers 4]
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import numbers
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+from bulk_importer import database_version
+from cache_governor import CacheGovernor, MISSING
+from config import API_CONFIG, SAMPLE_DATA_CONFIG
+
+MAX_HEADER_BYTES = 16 * 1024
+
+
+class RequestError(Exception):
+    """A request the client has to fix; the only error answered with a 4xx status"""
+
+    def __init__(self, message, status=HTTPStatus.BAD_REQUEST):
+        super().__init__(message)
+        self.status = status
+
+
+def _param(params, name, cast=str, default=None):
+    if name not in params:
+        return default
+    try:
+        return cast(params[name])
+    except ValueError:
+        raise RequestError(f"Invalid value for {name}: {params[name]}")
+
+
+def _flag(value):
+    return value.lower() in ('1', 'true', 'yes')
+
+
+def _list(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def _records(frame):
+    return json.loads(frame.to_json(orient='records', date_format='iso'))
+
+
+# Endpoint handlers run in worker processes, so they load data themselves and
+# return plain JSON-serializable values
+
+def recommendations(params):
+    from data_loader import load_destination_scores, load_traditional_arts
+    from utils import generate_recommendations
+
+    preferences = {
+        'preferred_states': _param(params, 'states', _list),
+        'art_categories': _param(params, 'categories', _list),
+        'prefer_offbeat': _param(params, 'prefer_offbeat', _flag, False),
+        'prefer_unesco': _param(params, 'prefer_unesco', _flag, False),
+        'budget_conscious': _param(params, 'budget_conscious', _flag, False)
+    }
+    arts = load_traditional_arts().rename(columns={'art_form': 'art_form_name'})
+    # Destination scores carry the tourism_saturation that prefer_offbeat ranks by
+    return generate_recommendations(preferences, load_destination_scores(), arts)
+
+
+def untapped_destinations(params):
+    from data_loader import load_destination_scores
+    from utils import identify_untapped_destinations
+
+    threshold = _param(params, 'threshold_percentile', float, 25)
+    if not 0 < threshold <= 100:
+        raise RequestError("threshold_percentile must be between 0 and 100")
+    return _records(identify_untapped_destinations(load_destination_scores(), threshold))
+
+
+def seasonality(params):
+    from data_loader import load_site_arrivals
+    from utils import calculate_seasonality_index
+
+    state = _param(params, 'state')
+    monthly = load_site_arrivals().rollup('month', state=state)
+    if monthly.empty:
+        raise RequestError(f"No arrivals recorded for {state}", HTTPStatus.NOT_FOUND)
+    frame = pd.DataFrame({'month_start': monthly.index, 'arrivals': monthly.sum(axis=1).values})
+    index = calculate_seasonality_index(frame, 'month_start', 'arrivals')
+    return {'region': state or 'India', 'index': {int(month): value for month, value in index.items()}}
+
+
+def economic_impact(params):
+    from data_loader import load_arrival_forecasts
+    from utils import calculate_economic_impact
+
+    options = {
+        'avg_spending_per_day': _param(params, 'avg_spending_per_day', float, 2500),
+        'avg_stay_days': _param(params, 'avg_stay_days', float, 3)
+    }
+    visitors = _param(params, 'visitors', int)
+    source = 'visitors'
+    if visitors is None:
+        # Default to the projected arrivals for the next 12 months
+        state = _param(params, 'state')
+        key = ('state', state) if state else ('national', 'India')
+        forecasts = load_arrival_forecasts()
+        if key not in forecasts.keys:
+            raise RequestError(f"No forecast for {state}", HTTPStatus.NOT_FOUND)
+        visitors = int(forecasts.projection(key).sum())
+        source = 'forecast'
+    impact = calculate_economic_impact(visitors, **options)
+    # Counts such as jobs_supported stay integers; only the money figures are floats
+    return {'visitors': visitors, 'source': source,
+            **{k: int(v) if isinstance(v, numbers.Integral) else float(v) for k, v in impact.items()}}
+
+
+def dataset(name):
+    def handler(params):
+        import data_loader
+        loader = {
+            'heritage-sites': data_loader.load_cultural_heritage_sites,
+            'traditional-arts': data_loader.load_traditional_arts,
+            'tourism-stats': data_loader.load_government_tourism_stats
+        }[name]
+        return _records(loader())
+    return handler
+
+
+ROUTES = {
+    '/api/recommendations': recommendations,
+    '/api/untapped-destinations': untapped_destinations,
+    '/api/seasonality': seasonality,
+    '/api/economic-impact': economic_impact,
+    '/api/datasets/heritage-sites': dataset('heritage-sites'),
+    '/api/datasets/traditional-arts': dataset('traditional-arts'),
+    '/api/datasets/tourism-stats': dataset('tourism-stats'),
+}
+
+
+def _run_route(path, params):
+    """Process-pool entry point; returns (status, payload), raising on anything but a RequestError"""
+    try:
+        return HTTPStatus.OK, ROUTES[path](params)
+    except RequestError as e:
+        return e.status, {'error': str(e)}
+
+
+def dataset_version():
+    """
+    Sample data is regenerated every refresh interval and imported releases
+    replace it, so responses are versioned by both
+    """
+    return f"{int(time.time() // SAMPLE_DATA_CONFIG['data_refresh_interval'])}-{database_version()}"
+
+
+def _etag_matches(if_none_match, etag):
+    """If-None-Match uses weak comparison and may list several tags or be *"""
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in tags or any(tag.removeprefix('W/') == etag for tag in tags)
+
+
+class _Response:
+    __slots__ = ('status', 'body', 'gzipped', 'etag', 'gzip_etag')
+
+    def __init__(self, status, payload, gzip_min_bytes):
+        self.status = status
+        self.body = json.dumps(payload, separators=(',', ':'), default=str).encode()
+        self.gzipped = gzip.compress(self.body, compresslevel=6) if len(self.body) >= gzip_min_bytes else None
+        digest = hashlib.sha1(self.body).hexdigest()
+        # Each encoding is a different representation, so it gets its own tag
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gzip"'
+
+
+class ApiServer:
+    """asyncio HTTP/1.1 server with keep-alive, response caching and request coalescing"""
+
+    def __init__(self, host=None, port=None, workers=None):
+        self.host = host or API_CONFIG["host"]
+        self.port = port or API_CONFIG["port"]
+        self.workers = workers or API_CONFIG["workers"] or os.cpu_count()
+        self.cache = CacheGovernor(budget_bytes=API_CONFIG["response_cache_mb"] * 1024 * 1024)
+        self._pool = None
+        self._pending = {}
+
+    async def serve(self):
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        server = await asyncio.start_server(self._handle_connection, self.host, self.port,
+                                            limit=MAX_HEADER_BYTES)
+        print(f"🎭 API listening on http://{self.host}:{self.port} with {self.workers} workers")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self._pool.shutdown(cancel_futures=True)
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = lines[0].split(' ')
+                except ValueError:
+                    writer.write(self._encode(HTTPStatus.BAD_REQUEST, b'', {}, keep_alive=False))
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    if ':' in line:
+                        name, value = line.split(':', 1)
+                        headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' and (version == 'HTTP/1.1' or connection == 'keep-alive')
+                writer.write(await self._respond(method, target, headers, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    async def _respond(self, method, target, headers, keep_alive):
+        if method not in ('GET', 'HEAD'):
+            return self._json(HTTPStatus.METHOD_NOT_ALLOWED, {'error': 'Only GET is supported'}, keep_alive)
+        url = urlsplit(target)
+        if url.path == '/health':
+            return self._json(HTTPStatus.OK, {'status': 'ok'}, keep_alive)
+        if url.path not in ROUTES:
+            return self._json(HTTPStatus.NOT_FOUND, {'error': f'Unknown endpoint {url.path}'}, keep_alive)
+
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            response = await self._cached_response(url.path, params)
+        except Exception as e:
+            return self._json(HTTPStatus.INTERNAL_SERVER_ERROR, {'error': f'{type(e).__name__}: {e}'}, keep_alive)
+
+        if response.status != HTTPStatus.OK:
+            # Errors are not cached server-side, so clients must not keep them either
+            return self._encode(response.status, response.body, {'Cache-Control': 'no-store'},
+                                keep_alive, head_only=method == 'HEAD')
+
+        body, etag = response.body, response.etag
+        extra = {'Cache-Control': 'public, max-age=60', 'Vary': 'Accept-Encoding'}
+        if response.gzipped is not None and 'gzip' in headers.get('accept-encoding', ''):
+            body, etag = response.gzipped, response.gzip_etag
+            extra['Content-Encoding'] = 'gzip'
+        extra['ETag'] = etag
+        if _etag_matches(headers.get('if-none-match', ''), etag):
+            extra.pop('Content-Encoding', None)
+            return self._encode(HTTPStatus.NOT_MODIFIED, b'', extra, keep_alive, head_only=True)
+        return self._encode(response.status, body, extra, keep_alive, head_only=method == 'HEAD')
+
+    async def _cached_response(self, path, params):
+        key = (dataset_version(), path, tuple(sorted(params.items())))
+        response = self.cache.get(key)
+        if response is not MISSING:
+            return response
+
+        # Identical requests arriving while one is computing share its result
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._compute(key, path, params))
+            self._pending[key] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(pending)
+
+    async def _compute(self, key, path, params):
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        status, payload = await loop.run_in_executor(self._pool, _run_route, path, params)
+        response = _Response(status, payload, API_CONFIG["gzip_min_bytes"])
+        if status == HTTPStatus.OK:
+            self.cache.put(key, response, cost=time.perf_counter() - started)
+        return response
+
+    def _json(self, status, payload, keep_alive):
+        body = json.dumps(payload).encode()
+        return self._encode(status, body, {'Cache-Control': 'no-store'}, keep_alive)
+
+    def _encode(self, status, body, extra, keep_alive, head_only=False):
+        lines = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}"
+        ]
+        lines += [f"{name}: {value}" for name, value in extra.items()]
+        head = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+        return head if head_only else head + body
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the cultural tourism analytics as JSON")
+    parser.add_argument('--host', default=API_CONFIG["host"])
+    parser.add_argument('--port', type=int, default=API_CONFIG["port"])
+    parser.add_argument('--workers', type=int, default=API_CONFIG["workers"])
+    args = parser.parse_args()
+    try:
+        asyncio.run(ApiServer(args.host, args.port, args.workers).serve())
+    except KeyboardInterrupt:
+        print("\n👋 API stopped")
+
+
+if __name__ == "__main__":
+    main()
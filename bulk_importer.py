@@ -0,0 +1,342 @@
+"""
+Bulk importer for India Tourism Statistics and ASI releases
+Streams large CSV/XLSX files in bounded-memory chunks, validates and coerces
+each chunk against the heritage-site, art-form or monthly-stats schema,
+normalizes state names against config.STATES_DATA and writes deduplicated rows
+into the SQLite database the data loaders read. Files are processed in
+parallel, one per worker process, with progress and error-row reporting.
+
+Run with: python bulk_importer.py sites:asi_2023.csv monthly:its_2023.xlsx [--database .cache/imports.db]
+"""
+
+import argparse
+import difflib
+import json
+import os
+import queue
+import re
+import sqlite3
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import Manager
+
+import pandas as pd
+from config import IMPORT_CONFIG, STATES_DATA
+
+SCHEMAS = {
+    'sites': {
+        'table': 'heritage_sites',
+        'columns': {
+            'site_name': 'text', 'state': 'state', 'type': 'text', 'unesco_status': 'bool',
+            'annual_visitors_2023': 'int', 'latitude': 'float', 'longitude': 'float'
+        },
+        'required': ['site_name', 'state'],
+        'key': ['site_name', 'state'],
+        'aliases': {'name': 'site_name', 'site': 'site_name'}
+    },
+    'arts': {
+        'table': 'traditional_arts',
+        'columns': {
+            'art_form': 'text', 'category': 'text', 'origin_state': 'state',
+            'practitioners_estimated': 'int', 'tourism_integration': 'int'
+        },
+        'required': ['art_form', 'origin_state'],
+        'key': ['art_form', 'origin_state'],
+        'aliases': {'name': 'art_form', 'state': 'origin_state'}
+    },
+    'monthly': {
+        'table': 'tourism_stats',
+        'columns': {
+            'month': 'month', 'domestic_tourists': 'int', 'international_tourists': 'int',
+            'revenue_crores': 'int', 'hotel_occupancy': 'float'
+        },
+        'required': ['month'],
+        'key': ['month'],
+        'aliases': {}
+    }
+}
+
+# Header spellings seen in the published releases, after lower-casing and
+# replacing punctuation with underscores; schema aliases take precedence
+HEADER_ALIASES = {
+    'name_of_monument': 'site_name', 'monument': 'site_name',
+    'state_ut': 'state', 'state_uts': 'state', 'state_name': 'state',
+    'category_of_site': 'type', 'site_type': 'type',
+    'unesco': 'unesco_status', 'world_heritage_site': 'unesco_status',
+    'visitors': 'annual_visitors_2023', 'total_visitors': 'annual_visitors_2023',
+    'lat': 'latitude', 'lon': 'longitude', 'lng': 'longitude', 'long': 'longitude',
+    'art': 'art_form', 'art_form_name': 'art_form', 'state_of_origin': 'origin_state',
+    'practitioners': 'practitioners_estimated', 'tourism_score': 'tourism_integration',
+    'period': 'month', 'month_year': 'month',
+    'dtv': 'domestic_tourists', 'domestic_tourist_visits': 'domestic_tourists',
+    'fta': 'international_tourists', 'foreign_tourist_arrivals': 'international_tourists',
+    'fee_revenue_crores': 'revenue_crores', 'occupancy': 'hotel_occupancy'
+}
+
+# Common abbreviations and older spellings of state names
+STATE_ALIASES = {
+    'tn': 'Tamil Nadu', 'tamilnadu': 'Tamil Nadu',
+    'ka': 'Karnataka', 'mysore state': 'Karnataka',
+    'kl': 'Kerala', 'rj': 'Rajasthan', 'mh': 'Maharashtra',
+    'orissa': 'Odisha', 'pondicherry': 'Puducherry', 'uttaranchal': 'Uttarakhand',
+    'nct of delhi': 'Delhi', 'up': 'Uttar Pradesh', 'mp': 'Madhya Pradesh'
+}
+
+TRUE_VALUES = {'yes', 'y', 'true', 't', '1'}
+FALSE_VALUES = {'no', 'n', 'false', 'f', '0'}
+
+
+def database_version(database=None):
+    """Modification time of the imports database, or None before anything was imported"""
+    try:
+        return os.stat(database or IMPORT_CONFIG["database"]).st_mtime_ns
+    except OSError:
+        return None
+
+
+def normalize_header(header, schema):
+    name = re.sub(r'[^0-9a-z]+', '_', str(header).strip().lower()).strip('_')
+    return schema['aliases'].get(name, HEADER_ALIASES.get(name, name))
+
+
+def normalize_state(name, cutoff=None):
+    """Canonical state name: a STATES_DATA key where one matches, otherwise the name as written"""
+    cleaned = ' '.join(str(name).split())
+    if not cleaned:
+        return None
+    lowered = cleaned.lower()
+    known = {state.lower(): state for state in STATES_DATA}
+    if lowered in known:
+        return known[lowered]
+    if lowered in STATE_ALIASES:
+        return STATE_ALIASES[lowered]
+    close = difflib.get_close_matches(lowered, list(known), n=1,
+                                      cutoff=cutoff or IMPORT_CONFIG["state_match_cutoff"])
+    return known[close[0]] if close else cleaned
+
+
+def _coerce(values, kind, state_cache):
+    """Coerced column and a mask of non-empty values that failed to parse"""
+    values = values.fillna('')
+    blank = values.str.strip() == ''
+    if kind == 'text':
+        return values.str.strip().mask(blank), pd.Series(False, index=values.index)
+    if kind == 'state':
+        for name in values[~blank].unique():
+            if name not in state_cache:
+                state_cache[name] = normalize_state(name)
+        return values.map(state_cache).mask(blank), pd.Series(False, index=values.index)
+    if kind == 'bool':
+        lowered = values.str.strip().str.lower()
+        result = pd.Series(pd.NA, index=values.index, dtype='boolean')
+        result[lowered.isin(TRUE_VALUES)] = True
+        result[lowered.isin(FALSE_VALUES)] = False
+        return result, result.isna() & ~blank
+    if kind == 'month':
+        parsed = pd.to_datetime(values.str.strip(), errors='coerce', format='mixed')
+        result = parsed.dt.to_period('M').dt.start_time.dt.strftime('%Y-%m-%d')
+        return result, parsed.isna() & ~blank
+    numbers = pd.to_numeric(values.str.replace(',', '').str.strip(), errors='coerce')
+    invalid = numbers.isna() & ~blank
+    if kind == 'int':
+        invalid |= numbers.notna() & ((numbers % 1 != 0) | (numbers < 0))
+        return numbers.where(~invalid).round().astype('Int64'), invalid
+    return numbers, invalid
+
+
+def validate_chunk(chunk, schema, state_cache):
+    """Split a raw chunk (all strings) into coerced valid rows and error rows with reasons"""
+    columns = schema['columns']
+    clean = pd.DataFrame(index=chunk.index)
+    reasons = pd.Series('', index=chunk.index)
+    for column, kind in columns.items():
+        if column not in chunk:
+            clean[column] = None
+            continue
+        clean[column], invalid = _coerce(chunk[column].astype('string'), kind, state_cache)
+        reasons[invalid] += f"invalid {column}; "
+    for column in schema['required']:
+        reasons[clean[column].isna() & (reasons == '')] += f"missing {column}; "
+    failed = reasons != ''
+    return clean[~failed], reasons[failed].str.rstrip('; ')
+
+
+def _read_chunks(path, schema, chunk_size, sheet=None):
+    """(first line number, DataFrame of strings) per chunk of a CSV or XLSX file"""
+    if path.lower().endswith(('.xlsx', '.xlsm')):
+        try:
+            import openpyxl
+        except ImportError:
+            raise RuntimeError("Reading Excel files requires openpyxl (pip install openpyxl)")
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = (workbook[sheet] if sheet else workbook.active).iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+            header = [normalize_header(h, schema) for h in header]
+            batch, line = [], 2
+            for row in rows:
+                cells = ['' if v is None else str(v) for v in row[:len(header)]]
+                batch.append(cells + [''] * (len(header) - len(cells)))
+                if len(batch) == chunk_size:
+                    yield line, pd.DataFrame(batch, columns=header, dtype='string')
+                    line += len(batch)
+                    batch = []
+            if batch:
+                yield line, pd.DataFrame(batch, columns=header, dtype='string')
+        finally:
+            workbook.close()
+    else:
+        line = 2
+        reader = pd.read_csv(path, dtype=str, chunksize=chunk_size, keep_default_na=False,
+                             skipinitialspace=True, encoding_errors='replace')
+        for chunk in reader:
+            chunk.columns = [normalize_header(c, schema) for c in chunk.columns]
+            chunk.index = pd.RangeIndex(0, len(chunk))
+            yield line, chunk
+            line += len(chunk)
+
+
+def _create_tables(conn, schema):
+    columns = ', '.join(f'"{c}"' for c in schema['columns'])
+    key = ', '.join(f'"{c}"' for c in schema['key'])
+    conn.execute(f'CREATE TABLE IF NOT EXISTS "{schema["table"]}" ({columns}, UNIQUE ({key}))')
+    conn.execute('CREATE TABLE IF NOT EXISTS import_errors '
+                 '(source TEXT, line INTEGER, reason TEXT, row TEXT)')
+
+
+def _rows(frame):
+    return frame.astype(object).where(frame.notna(), None).itertuples(index=False, name=None)
+
+
+def import_file(schema_name, path, staging, chunk_size, sheet=None, progress=None):
+    """
+    Worker: import one file into its own staging database
+
+    Later rows with the same key replace earlier ones. Returns row counts.
+    """
+    schema = SCHEMAS[schema_name]
+    source = os.path.abspath(path)
+    columns = list(schema['columns'])
+    names = ', '.join(f'"{c}"' for c in columns)
+    placeholders = ', '.join('?' * len(columns))
+    insert = f'INSERT OR REPLACE INTO "{schema["table"]}" ({names}) VALUES ({placeholders})'
+    state_cache = {}
+    counts = {'file': path, 'rows': 0, 'imported': 0, 'errors': 0}
+
+    with sqlite3.connect(staging) as conn:
+        _create_tables(conn, schema)
+        for line, chunk in _read_chunks(path, schema, chunk_size, sheet):
+            # Two headers can normalize to the same column; the first one wins
+            chunk = chunk.loc[:, ~chunk.columns.duplicated()]
+            valid, reasons = validate_chunk(chunk, schema, state_cache)
+            conn.executemany(insert, _rows(valid[columns]))
+            conn.executemany('INSERT INTO import_errors VALUES (?, ?, ?, ?)', [
+                (source, line + int(i), reason, json.dumps(chunk.loc[i].fillna('').to_dict()))
+                for i, reason in reasons.items()
+            ])
+            conn.commit()
+            counts['rows'] += len(chunk)
+            counts['imported'] += len(valid)
+            counts['errors'] += len(reasons)
+            if progress is not None:
+                progress.put(dict(counts))
+    return counts
+
+
+def _merge(database, schema_name, path, staging):
+    table = SCHEMAS[schema_name]['table']
+    with sqlite3.connect(database) as conn:
+        _create_tables(conn, SCHEMAS[schema_name])
+        conn.execute('ATTACH DATABASE ? AS staging', (staging,))
+        conn.execute(f'INSERT OR REPLACE INTO main."{table}" SELECT * FROM staging."{table}"')
+        # A re-imported file's errors replace the ones recorded for it last time
+        conn.execute('DELETE FROM main.import_errors WHERE source = ?', (os.path.abspath(path),))
+        conn.execute('INSERT INTO main.import_errors SELECT * FROM staging.import_errors')
+        conn.commit()
+        conn.execute('DETACH DATABASE staging')
+
+
+def _print_progress(counts):
+    print(f"   • {os.path.basename(counts['file'])}: {counts['rows']:,} rows read, "
+          f"{counts['imported']:,} valid, {counts['errors']:,} errors")
+
+
+def run_import(inputs, database=None, chunk_size=None, workers=None, sheet=None, on_progress=_print_progress):
+    """
+    Import (schema, path) pairs into database in parallel
+
+    Staging databases are merged in input order, so for duplicate keys the
+    row from the later file wins. Returns per-file counts.
+    """
+    database = database or IMPORT_CONFIG["database"]
+    chunk_size = chunk_size or IMPORT_CONFIG["chunk_size"]
+    for schema_name, path in inputs:
+        if schema_name not in SCHEMAS:
+            raise ValueError(f"Unknown schema {schema_name}; expected one of {', '.join(SCHEMAS)}")
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+    os.makedirs(os.path.dirname(database) or '.', exist_ok=True)
+
+    with tempfile.TemporaryDirectory() as staging_dir, Manager() as manager:
+        progress = manager.Queue()
+        stop = threading.Event()
+
+        def report():
+            while not stop.is_set() or not progress.empty():
+                try:
+                    on_progress(progress.get(timeout=0.2))
+                except queue.Empty:
+                    continue
+
+        reporter = threading.Thread(target=report, daemon=True)
+        reporter.start()
+        staging = [os.path.join(staging_dir, f"part_{i}.db") for i in range(len(inputs))]
+        results = [None] * len(inputs)
+        try:
+            with ProcessPoolExecutor(max_workers=workers or min(len(inputs), os.cpu_count())) as pool:
+                futures = {
+                    pool.submit(import_file, schema_name, path, staging[i], chunk_size, sheet, progress): i
+                    for i, (schema_name, path) in enumerate(inputs)
+                }
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+        finally:
+            stop.set()
+            reporter.join()
+
+        for (schema_name, path), part in zip(inputs, staging):
+            _merge(database, schema_name, path, part)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import government tourism releases into the dashboard database")
+    parser.add_argument('inputs', nargs='+', metavar='SCHEMA:PATH',
+                        help=f"Schema ({', '.join(SCHEMAS)}) and CSV/XLSX file, e.g. sites:asi_2023.csv")
+    parser.add_argument('--database', default=IMPORT_CONFIG["database"])
+    parser.add_argument('--chunk-size', type=int, default=IMPORT_CONFIG["chunk_size"])
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--sheet', default=None, help="Worksheet to read from Excel files")
+    args = parser.parse_args()
+
+    inputs = []
+    for item in args.inputs:
+        schema_name, _, path = item.partition(':')
+        if not path:
+            parser.error(f"Expected SCHEMA:PATH, got {item}")
+        inputs.append((schema_name, path))
+
+    print(f"📥 Importing {len(inputs)} file(s) into {args.database}")
+    results = run_import(inputs, args.database, args.chunk_size, args.workers, args.sheet)
+    total_errors = sum(r['errors'] for r in results)
+    print(f"✅ Imported {sum(r['imported'] for r in results):,} rows "
+          f"({sum(r['rows'] for r in results):,} read)")
+    if total_errors:
+        print(f"⚠️ {total_errors:,} rows rejected; see the import_errors table in {args.database}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+"""
+Memory-budgeted cache for datasets and derived analytics
+Measures the deep size of every cached DataFrame, array or figure, keeps the
+total under a global budget with cost-aware LRU eviction and can spill evicted
+entries to disk so they are reloaded rather than recomputed
+"""
+
+import copy
+import functools
+import hashlib
+import multiprocessing.util
+import os
+import pickle
+import shutil
+import sys
+import threading
+import time
+import weakref
+
+import numpy as np
+import pandas as pd
+import snapshots
+from config import CACHE_CONFIG
+
+MISSING = object()
+
+
+def deep_sizeof(obj, _seen=None):
+    """Approximate bytes held by obj, following containers and pandas/NumPy buffers"""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if hasattr(obj, 'to_plotly_json'):
+        # Plotly figures keep their data as nested dicts and lists
+        return deep_sizeof(obj.to_plotly_json(), _seen)
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, _seen) + deep_sizeof(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, _seen) for item in obj)
+    elif hasattr(obj, '__dict__'):
+        size += deep_sizeof(vars(obj), _seen)
+    elif hasattr(obj, '__slots__'):
+        size += sum(deep_sizeof(getattr(obj, name, None), _seen) for name in obj.__slots__)
+    return size
+
+
+class _Entry:
+    __slots__ = ('value', 'size', 'cost', 'priority', 'created')
+
+    def __init__(self, value, size, cost, priority, created):
+        self.value = value
+        self.size = size
+        self.cost = cost
+        self.priority = priority
+        self.created = created
+
+
+class CacheGovernor:
+    """
+    Process-wide cache with a memory budget
+
+    Eviction follows GreedyDual-Size: an entry's priority is the current clock
+    plus its compute time per byte, refreshed on every hit, and the lowest
+    priority goes first while the clock advances to it. Cheap, large, idle
+    entries leave before expensive, small, busy ones. Evicted entries are
+    pickled into a per-process directory under spill_root when one is
+    configured; it is emptied when the process starts using it and removed
+    when the process exits, along with directories left by dead processes.
+    """
+
+    def __init__(self, budget_bytes, spill_root=None, spill_budget_bytes=0):
+        self.budget_bytes = budget_bytes
+        self.spill_root = spill_root
+        self.spill_dir = None
+        self.spill_budget_bytes = spill_budget_bytes
+        self._entries = {}
+        self._spilled = {}
+        self._tracked = {}
+        self._used = 0
+        self._clock = 0.0
+        self._lock = threading.RLock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'spills': 0, 'spill_hits': 0}
+        if spill_root:
+            self._claim_spill_dir()
+            # Worker processes inherit this object; each gets a directory of its own
+            multiprocessing.util.register_after_fork(self, CacheGovernor._claim_spill_dir)
+
+    def _claim_spill_dir(self):
+        self._lock = threading.RLock()
+        # Spilled files inherited from a parent process belong to the parent
+        self._spilled = {}
+        self.spill_dir = os.path.join(self.spill_root, str(os.getpid()))
+        _remove_orphaned_spill_dirs(self.spill_root)
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
+        multiprocessing.util.Finalize(self, shutil.rmtree, args=(self.spill_dir,),
+                                      kwargs={'ignore_errors': True}, exitpriority=0)
+
+    def get(self, key, ttl=None):
+        """Cached value for key, or MISSING when absent or older than ttl seconds"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._load_spilled(key)
+            if entry is None or (ttl is not None and time.time() - entry.created > ttl):
+                if entry is not None:
+                    self._drop(key)
+                self._stats['misses'] += 1
+                return MISSING
+            entry.priority = self._clock + entry.cost / max(entry.size, 1)
+            self._stats['hits'] += 1
+            return entry.value
+
+    def put(self, key, value, cost=0.0, created=None):
+        """Store value, evicting lower-priority entries until it fits the budget"""
+        size = deep_sizeof(value)
+        with self._lock:
+            self._drop(key)
+            if size > self.budget_bytes:
+                return
+            while self._used + size > self.budget_bytes and self._entries:
+                self._evict()
+            priority = self._clock + cost / max(size, 1)
+            self._entries[key] = _Entry(value, size, cost, priority, created or time.time())
+            self._used += size
+
+    def track(self, name, value):
+        """
+        Count a long-lived object cached elsewhere (e.g. by st.cache_resource) against the budget
+
+        Its size is measured now and released when the object is garbage
+        collected or another object is tracked under the same name; cached
+        entries are evicted to make room for it.
+        """
+        size = deep_sizeof(value)
+        with self._lock:
+            self._untrack(name)
+            self._tracked[name] = (weakref.ref(value, lambda ref: self._untrack(name, ref)), size)
+            self._used += size
+            while self._used > self.budget_bytes and self._entries:
+                self._evict()
+
+    def _untrack(self, name, reference=None):
+        with self._lock:
+            tracked = self._tracked.get(name)
+            # A collected object only releases its own size, not a replacement's
+            if tracked is None or (reference is not None and tracked[0] is not reference):
+                return
+            del self._tracked[name]
+            self._used -= tracked[1]
+
+    def clear(self, match=None):
+        """Drop every entry, or only those whose key satisfies match, from memory and disk"""
+        with self._lock:
+            for key in list(self._entries) + list(self._spilled):
+                if match is None or match(key):
+                    self._drop(key)
+
+    def export(self):
+        """In-memory entries as key -> (value, cost), e.g. for a warm-start snapshot"""
+        with self._lock:
+            return {key: (entry.value, entry.cost) for key, entry in self._entries.items()}
+
+    def usage(self):
+        """Current memory use, budget and hit/eviction counters"""
+        with self._lock:
+            return {
+                'used_bytes': self._used,
+                'budget_bytes': self.budget_bytes,
+                'entries': len(self._entries),
+                'spilled_entries': len(self._spilled),
+                'spilled_bytes': sum(size for _, size, _ in self._spilled.values()),
+                'tracked_bytes': sum(size for _, size in self._tracked.values()),
+                'tracked': {name: size for name, (_, size) in self._tracked.items()},
+                **self._stats
+            }
+
+    def _evict(self):
+        key = min(self._entries, key=lambda k: self._entries[k].priority)
+        entry = self._entries.pop(key)
+        self._used -= entry.size
+        self._clock = entry.priority
+        self._stats['evictions'] += 1
+        if self.spill_dir:
+            self._spill(key, entry)
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._used -= entry.size
+        self._remove_spill(key)
+
+    def _spill_path(self, key):
+        digest = hashlib.sha256(repr(key).encode()).hexdigest()
+        return os.path.join(self.spill_dir, f"{digest}.pkl")
+
+    def _spill(self, key, entry):
+        try:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            path = self._spill_path(key)
+            with open(path, 'wb') as f:
+                pickle.dump((entry.value, entry.cost, entry.created), f, protocol=pickle.HIGHEST_PROTOCOL)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            # Unpicklable or unwritable entries are simply recomputed later
+            return
+        self._spilled[key] = (path, os.path.getsize(path), time.time())
+        self._stats['spills'] += 1
+
+        spilled_bytes = sum(size for _, size, _ in self._spilled.values())
+        while spilled_bytes > self.spill_budget_bytes and self._spilled:
+            oldest = min(self._spilled, key=lambda k: self._spilled[k][2])
+            spilled_bytes -= self._spilled[oldest][1]
+            self._remove_spill(oldest)
+
+    def _load_spilled(self, key):
+        if key not in self._spilled:
+            return None
+        path = self._spilled[key][0]
+        try:
+            with open(path, 'rb') as f:
+                value, cost, created = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            self._remove_spill(key)
+            return None
+        self._remove_spill(key)
+        self._stats['spill_hits'] += 1
+        self.put(key, value, cost=cost, created=created)
+        return self._entries.get(key) or _Entry(value, 0, cost, self._clock, created)
+
+    def _remove_spill(self, key):
+        spilled = self._spilled.pop(key, None)
+        if spilled is not None:
+            try:
+                os.remove(spilled[0])
+            except OSError:
+                pass
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+def _remove_orphaned_spill_dirs(spill_root):
+    """Delete spill directories of processes that are no longer running"""
+    try:
+        names = os.listdir(spill_root)
+    except OSError:
+        return
+    for name in names:
+        path = os.path.join(spill_root, name)
+        if name.isdigit() and not _process_alive(int(name)):
+            shutil.rmtree(path, ignore_errors=True)
+        elif name.endswith('.pkl'):
+            # Spilled by a version that kept every process's files in one directory
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # Another process starting at the same time removed it first
+                pass
+
+
+governor = CacheGovernor(
+    budget_bytes=CACHE_CONFIG["memory_budget_mb"] * 1024 * 1024,
+    spill_root=CACHE_CONFIG["spill_dir"],
+    spill_budget_bytes=CACHE_CONFIG["spill_budget_mb"] * 1024 * 1024
+)
+
+
+def _cache_key(func, args, kwargs):
+    try:
+        payload = pickle.dumps((args, sorted(kwargs.items())), protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        payload = repr((args, sorted(kwargs.items()))).encode()
+    return (func.__module__, func.__qualname__, hashlib.sha256(payload).hexdigest())
+
+
+def _copy(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy()
+    if isinstance(value, tuple):
+        return tuple(_copy(item) for item in value)
+    return copy.deepcopy(value)
+
+
+def governed_cache(func=None, *, ttl=None, depends_on=None):
+    """
+    Drop-in replacement for st.cache_data backed by the global CacheGovernor
+
+    Like st.cache_data, callers receive a copy so mutating a returned frame
+    never corrupts the cached one. depends_on is called on every lookup and
+    its result joins the key, so a change in an outside source (e.g. a
+    database's modification time) is a cache miss.
+    """
+    if func is None:
+        return functools.partial(governed_cache, ttl=ttl, depends_on=depends_on)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = _cache_key(func, args, kwargs)
+        if depends_on is not None:
+            key += (depends_on(),)
+        value = governor.get(key, ttl=ttl)
+        if value is MISSING:
+            warm = snapshots.get(key)
+            if warm is not None:
+                value, cost = warm
+            else:
+                started = time.perf_counter()
+                value = func(*args, **kwargs)
+                cost = time.perf_counter() - started
+            governor.put(key, value, cost=cost)
+        return _copy(value)
+
+    wrapper.clear = lambda: governor.clear(
+        lambda key: key[:2] == (func.__module__, func.__qualname__)
+    )
+    return wrapper
@@ -0,0 +1,71 @@
+"""
+Reusable Streamlit components for the Cultural Tourism Dashboard
+"""
+
+import math
+
+import streamlit as st
+from config import PAGINATION_CONFIG
+
+
+def _jump_to_item(backend, table, key, search_column, filters, order_by, descending, page_size):
+    # Runs once when the jump box changes, so paging away afterwards is not undone
+    target = st.session_state[f"{key}_jump"].strip()
+    if not target:
+        return
+    position = backend.position(table, search_column, target, filters=filters,
+                                order_by=order_by, descending=descending)
+    if position is None:
+        st.session_state[f"{key}_missing"] = target
+    else:
+        st.session_state[f"{key}_page"] = position // page_size + 1
+
+
+def paginated_details(backend, table, key, label, render_item, filters=None,
+                      sort_options=None, search_column=None, page_size=None):
+    """
+    Render one page of expandable detail rows fetched from the data backend
+
+    Only the visible window is queried and turned into widgets, so render cost
+    stays constant however many rows match. Sorting and jump-to-item run as
+    backend queries; sort_options maps a label to (column, descending).
+    label(row) gives each expander title and render_item(row) fills it.
+    """
+    page_size = page_size or PAGINATION_CONFIG["page_size"]
+    page_key = f"{key}_page"
+
+    col1, col2 = st.columns([1, 1])
+    order_by, descending = None, False
+    if sort_options:
+        with col1:
+            sort_label = st.selectbox("Sort by", list(sort_options), key=f"{key}_sort")
+        order_by, descending = sort_options[sort_label]
+
+    total = backend.count(table, filters=filters)
+    pages = max(math.ceil(total / page_size), 1)
+
+    if search_column is not None:
+        with col2:
+            st.text_input("Jump to", key=f"{key}_jump", placeholder="Exact name",
+                          on_change=_jump_to_item,
+                          args=(backend, table, key, search_column, filters, order_by, descending, page_size))
+        missing = st.session_state.pop(f"{key}_missing", None)
+        if missing:
+            st.warning(f"No match for '{missing}' with the current filters")
+
+    # Filters may have shrunk the result since the page was chosen
+    st.session_state[page_key] = min(max(st.session_state.get(page_key, 1), 1), pages)
+
+    rows = backend.select(table, filters=filters, order_by=order_by, descending=descending,
+                          limit=page_size, offset=(st.session_state[page_key] - 1) * page_size)
+    target = st.session_state.get(f"{key}_jump", "").strip() if search_column is not None else ""
+    for _, row in rows.iterrows():
+        with st.expander(label(row), expanded=bool(target) and row[search_column] == target):
+            render_item(row)
+
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        st.number_input("Page", min_value=1, max_value=pages, step=1, key=page_key)
+    with col2:
+        first = (st.session_state[page_key] - 1) * page_size
+        st.caption(f"Showing {min(first + 1, total)}-{min(first + page_size, total)} of {total:,}")
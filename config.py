@@ -50,3 +50,61 @@ STATES_DATA = {
     "Karnataka": {"heritage_sites": 25, "classical_music": True, "crafts": 20},
     "Maharashtra": {"caves": 8, "forts": 20, "folk_arts": 10}
 }
+
+# Daily arrivals history kept per site in the time-series store
+TIMESERIES_CONFIG = {
+    "history_start": "2019-01-01",
+    "history_end": "2023-12-31",
+    "international_share": 0.05,  # Share of site visitors arriving from abroad
+    "max_chart_points": 120,  # Trend charts switch to a coarser rollup above this
+}
+
+# Seasonal forecasting of monthly arrivals
+FORECAST_CONFIG = {
+    "season_length": 12,  # Months per seasonal cycle
+    "horizon": 12,  # Months projected ahead
+    "smoothing_grid": (0.1, 0.3, 0.5),  # Candidate level/trend/season smoothing weights
+    "refit_every": 12,  # Months of incremental updates before smoothing weights are refitted
+}
+
+# Memory budget for cached datasets and derived analytics
+CACHE_CONFIG = {
+    "memory_budget_mb": 256,  # Total size of in-memory cached values
+    "spill_dir": ".cache/spill",  # Evicted entries are pickled into a subdirectory per process; None disables spilling
+    "spill_budget_mb": 1024,  # Oldest spilled entries are deleted beyond this
+}
+
+# Query backend; "sqlite" is the embedded stand-in until the warehouse is connected
+DATA_BACKEND_CONFIG = {
+    "engine": "sqlite",
+    "database": ":memory:",  # Or a file path for a persistent local database
+    "pool_size": 4,  # Connections shared between concurrent sessions
+    "statement_cache_size": 128,  # Prepared statements kept per connection
+}
+
+# Paginated detail lists
+PAGINATION_CONFIG = {
+    "page_size": 10,  # Detail rows rendered per page
+}
+
+# JSON API served alongside the dashboard
+API_CONFIG = {
+    "host": "0.0.0.0",
+    "port": 8502,
+    "workers": None,  # Processes for CPU-bound scoring; None uses every core
+    "response_cache_mb": 64,  # Memory budget for cached responses
+    "gzip_min_bytes": 1024,  # Smaller responses are sent uncompressed
+}
+
+# Launcher warm start
+WARM_START_CONFIG = {
+    "snapshot_path": ".cache/warm_start.pkl",  # Datasets prebuilt by run_app.py
+    "startup_timeout": 60,  # Seconds to wait for the dashboard to answer
+}
+
+# Bulk import of government CSV/XLSX releases
+IMPORT_CONFIG = {
+    "database": ".cache/imports.db",  # SQLite file the loaders read imported tables from
+    "chunk_size": 50000,  # Rows parsed and validated at a time
+    "state_match_cutoff": 0.85,  # Minimum similarity for fuzzy state-name matches
+}
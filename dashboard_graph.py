@@ -0,0 +1,190 @@
+"""
+Derived data and figures behind the dashboard pages
+Each function is a node of the dashboard Dataflow; streamlit_app supplies the
+run inputs (one per backend table, site_arrivals, forecasts, art_filters,
+trend_window, trend_region) and reads only the nodes the current page shows
+"""
+
+import plotly.express as px
+import plotly.graph_objects as go
+from config import TIMESERIES_CONFIG
+from dataflow import Dataflow
+from utils import calculate_economic_impact
+
+flow = Dataflow('dashboard')
+
+PRESERVATION_COLORS = {'Good': '#4CAF50', 'Excellent': '#2196F3', 'Fair': '#FFC107', 'At Risk': '#F44336'}
+PEAK_MONTHS = [10, 11, 12, 1, 2, 3]
+TABLES = ('art_forms', 'cultural_sites', 'govt_schemes')
+
+
+def _region_state(region):
+    return None if region == "All India" else region
+
+
+def table_inputs(backend):
+    """Run inputs for the backend tables; nodes declare the tables they read"""
+    return {name: backend.table(name) for name in TABLES}
+
+
+def first_render_inputs(backend, site_arrivals, forecasts):
+    """Run inputs of every page as it first renders, with each widget at its default"""
+    first_day, last_day = site_arrivals.date_range()
+    return [
+        table_inputs(backend),
+        {**table_inputs(backend),
+         'art_filters': {'category': None, 'state': None, 'preservation_status': None}},
+        {'site_arrivals': site_arrivals, 'forecasts': forecasts,
+         'trend_window': (first_day.date(), last_day.date(), TIMESERIES_CONFIG["max_chart_points"]),
+         'trend_region': "All India"}
+    ]
+
+
+# Traditional Art Forms
+
+@flow.node(inputs=['art_forms'])
+def art_filter_options(art_forms):
+    return {column: art_forms.distinct(column)
+            for column in ('category', 'state', 'preservation_status')}
+
+
+@flow.node(inputs=['art_forms', 'art_filters'])
+def filtered_art_forms(art_forms, art_filters):
+    return art_forms.select(filters=art_filters)
+
+
+@flow.node(inputs=['art_forms', 'art_filters'])
+def art_category_counts(art_forms, art_filters):
+    return art_forms.count_by('category', filters=art_filters)
+
+
+@flow.node(inputs=['filtered_art_forms'])
+def tourism_score_figure(filtered_art_forms):
+    fig = px.bar(filtered_art_forms, x='name', y='tourism_score',
+                 color='preservation_status',
+                 title='Tourism Potential Score by Art Form',
+                 color_discrete_map=PRESERVATION_COLORS)
+    fig.update_layout(height=400)
+    return fig
+
+
+@flow.node(inputs=['art_category_counts'])
+def category_figure(art_category_counts):
+    fig = px.pie(values=art_category_counts.values, names=art_category_counts.index,
+                 title='Distribution by Category',
+                 color_discrete_sequence=['#FF6B35', '#F7931E', '#F8B500', '#004643'])
+    fig.update_layout(height=400)
+    return fig
+
+
+# Cultural Experiences
+
+@flow.node(inputs=['cultural_sites'])
+def site_map_figure(cultural_sites):
+    map_sites = cultural_sites.select(columns=['site', 'state', 'visitors_2023', 'lat', 'lon'])
+    fig = px.scatter_mapbox(map_sites,
+                            lat="lat",
+                            lon="lon",
+                            hover_name="site",
+                            hover_data=["state", "visitors_2023"],
+                            size="visitors_2023",
+                            color="visitors_2023",
+                            color_continuous_scale="Viridis",
+                            size_max=30,
+                            zoom=4,
+                            height=600,
+                            title="Major Cultural Sites and Visitor Traffic")
+    fig.update_layout(mapbox_style="open-street-map")
+    return fig
+
+
+@flow.node(inputs=['cultural_sites'])
+def top_sites(cultural_sites):
+    return cultural_sites.select(columns=['site', 'visitors_2023'],
+                                 order_by='visitors_2023', descending=True, limit=5)
+
+
+@flow.node(inputs=['top_sites'])
+def top_sites_figure(top_sites):
+    return px.bar(top_sites, x='visitors_2023', y='site', orientation='h',
+                  title='Top 5 Most Visited Cultural Sites (2023)',
+                  color='visitors_2023',
+                  color_continuous_scale='Blues')
+
+
+# Tourism Analytics
+
+@flow.node(inputs=['site_arrivals', 'trend_window', 'trend_region'])
+def arrival_trend(site_arrivals, trend_window, trend_region):
+    """Resolution and arrivals (with totals) for the visible range, read from the rollups"""
+    start, end, max_points = trend_window
+    resolution, trend = site_arrivals.query(start, end, state=_region_state(trend_region),
+                                            max_points=max_points)
+    trend = trend.assign(total_tourists=trend['domestic_tourists'] + trend['international_tourists'])
+    return resolution, trend
+
+
+@flow.node(inputs=['arrival_trend'])
+def arrival_trend_figure(arrival_trend):
+    resolution, trend = arrival_trend
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=trend.index, y=trend['domestic_tourists'],
+                             name='Domestic Tourists', line=dict(color='#FF6B35', width=3)))
+    fig.add_trace(go.Scatter(x=trend.index, y=trend['international_tourists'],
+                             name='International Tourists', line=dict(color='#004643', width=3)))
+    fig.add_trace(go.Scatter(x=trend.index, y=trend['total_tourists'],
+                             name='Total', line=dict(color='#F7931E', width=3, dash='dash')))
+    fig.update_layout(title=f'Tourist Arrivals at Heritage Sites ({resolution.title()})',
+                      xaxis_title=resolution.title(),
+                      yaxis_title='Number of Tourists',
+                      height=400)
+    return fig
+
+
+@flow.node(inputs=['forecasts', 'site_arrivals', 'trend_region'])
+def arrival_outlook(forecasts, site_arrivals, trend_region):
+    """Last 24 modelled months and the 12-month projection for the region"""
+    state = _region_state(trend_region)
+    projection = forecasts.projection(('national', 'India') if state is None else ('state', state))
+    history = site_arrivals.rollup('month', state=state)
+    history = history.loc[history.index <= forecasts.months[-1]].tail(24).sum(axis=1)
+    return history, projection
+
+
+@flow.node(inputs=['arrival_outlook', 'trend_region'])
+def outlook_figure(arrival_outlook, trend_region):
+    history, projection = arrival_outlook
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=history.index, y=history.values,
+                             name='Actual', line=dict(color='#F7931E', width=3)))
+    fig.add_trace(go.Scatter(x=projection.index, y=projection.values,
+                             name='Forecast', line=dict(color='#004643', width=3, dash='dot')))
+    fig.update_layout(title=f'Projected Monthly Arrivals - {trend_region}',
+                      xaxis_title='Month',
+                      yaxis_title='Number of Tourists',
+                      height=350)
+    return fig
+
+
+@flow.node(inputs=['arrival_outlook'])
+def outlook_summary(arrival_outlook):
+    _, projection = arrival_outlook
+    projected_visitors = int(projection.sum())
+    return {
+        'projected_visitors': projected_visitors,
+        'impact': calculate_economic_impact(projected_visitors),
+        'peak_share': projection[projection.index.month.isin(PEAK_MONTHS)].sum() / max(projection.sum(), 1)
+    }
+
+
+# Data Insights
+
+@flow.node(inputs=['govt_schemes'])
+def scheme_budget_figure(govt_schemes):
+    fig = px.bar(govt_schemes.select(columns=['scheme', 'budget_crores']), x='scheme', y='budget_crores',
+                 title='Government Investment in Cultural Tourism Schemes',
+                 color='budget_crores',
+                 color_continuous_scale='Viridis',
+                 text='budget_crores')
+    fig.update_traces(texttemplate='₹%{text} Cr', textposition='outside')
+    return fig
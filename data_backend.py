@@ -0,0 +1,325 @@
+"""
+Pluggable query backends for the Cultural Tourism Dashboard
+Pages describe filters, top-N lookups and value counts and the backend turns
+them into parameterized SQL, so only result-sized data reaches the app.
+SQLiteBackend is the local stand-in for the planned warehouse.
+"""
+
+import contextlib
+import hashlib
+import itertools
+import queue
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+
+import pandas as pd
+from config import DATA_BACKEND_CONFIG
+
+
+class DataBackend(ABC):
+    """
+    Interface every data backend implements
+
+    filters map column names to a value (equality), a list (membership) or
+    None (ignored), so page selections like "All" can be passed through as-is.
+    """
+
+    @abstractmethod
+    def load_table(self, name, frame):
+        ...
+
+    @abstractmethod
+    def table_version(self, table):
+        """Changes whenever table is reloaded with different contents"""
+
+    def table(self, name):
+        return Table(self, name)
+
+    @abstractmethod
+    def select(self, table, columns=None, filters=None, order_by=None, descending=False,
+               limit=None, offset=None):
+        ...
+
+    @abstractmethod
+    def count(self, table, filters=None):
+        ...
+
+    @abstractmethod
+    def position(self, table, column, value, filters=None, order_by=None, descending=False):
+        ...
+
+    @abstractmethod
+    def distinct(self, table, column, filters=None):
+        ...
+
+    @abstractmethod
+    def count_by(self, table, column, filters=None):
+        ...
+
+
+class Table:
+    """
+    One backend table, handed to a Dataflow as a run input
+
+    Its version follows only this table, so reloading another table leaves
+    the nodes that read this one memoized.
+    """
+
+    def __init__(self, backend, name):
+        self.backend = backend
+        self.name = name
+
+    @property
+    def version(self):
+        return self.backend.table_version(self.name)
+
+    def select(self, **options):
+        return self.backend.select(self.name, **options)
+
+    def distinct(self, column, **options):
+        return self.backend.distinct(self.name, column, **options)
+
+    def count_by(self, column, **options):
+        return self.backend.count_by(self.name, column, **options)
+
+
+def _content_hash(frame):
+    digest = hashlib.sha256(repr((list(frame.columns), [str(t) for t in frame.dtypes])).encode())
+    try:
+        digest.update(pd.util.hash_pandas_object(frame, index=False).values.tobytes())
+    except TypeError:
+        # Cells holding unhashable objects such as lists
+        digest.update(frame.to_json(orient='split', date_format='iso').encode())
+    return digest.hexdigest()
+
+
+class _ConnectionPool:
+    """Fixed set of connections handed out one caller at a time"""
+
+    def __init__(self, connect, size):
+        self._connections = queue.Queue()
+        for _ in range(size):
+            self._connections.put(connect())
+
+    @contextlib.contextmanager
+    def connection(self):
+        conn = self._connections.get()
+        try:
+            yield conn
+        finally:
+            self._connections.put(conn)
+
+
+class _ReadWriteLock:
+    """Many readers or one writer; a waiting writer holds off new readers"""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writing = False
+        self._writers_waiting = 0
+
+    @contextlib.contextmanager
+    def reading(self):
+        with self._condition:
+            self._condition.wait_for(lambda: not self._writing and not self._writers_waiting)
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                self._condition.notify_all()
+
+    @contextlib.contextmanager
+    def writing(self):
+        with self._condition:
+            self._writers_waiting += 1
+            self._condition.wait_for(lambda: not self._writing and not self._readers)
+            self._writers_waiting -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+
+class SQLiteBackend(DataBackend):
+    """
+    Embedded SQLite backend sharing one in-memory database across a connection pool
+
+    Queries are generated with placeholders only, so each distinct query shape
+    compiles once per connection and is reused from SQLite's statement cache.
+    Tables are loaded into a staging table and swapped in with one short
+    exclusive transaction, so concurrent queries see either the old or the
+    new table, never a missing or half-written one.
+    """
+
+    _database_ids = itertools.count()
+
+    def __init__(self, database=None, pool_size=None, statement_cache_size=None):
+        database = database or DATA_BACKEND_CONFIG["database"]
+        if database == ':memory:':
+            # A named shared-cache database lets every pooled connection see the same tables
+            database = f"file:sanskritisetu_{next(self._database_ids)}?mode=memory&cache=shared"
+        statement_cache_size = statement_cache_size or DATA_BACKEND_CONFIG["statement_cache_size"]
+
+        def connect():
+            return sqlite3.connect(database, uri=database.startswith('file:'),
+                                   check_same_thread=False,
+                                   cached_statements=statement_cache_size)
+
+        self._pool = _ConnectionPool(connect, pool_size or DATA_BACKEND_CONFIG["pool_size"])
+        self._tables_lock = _ReadWriteLock()
+        self._load_lock = threading.Lock()
+        self._schemas = {}
+        self._contents = {}
+        self._loads = 0
+
+    def load_table(self, name, frame):
+        """Replace table name with the contents of frame"""
+        staging = f"_staging_{name}"
+        with self._load_lock, self._pool.connection() as conn:
+            # Creating the staging table changes the schema, which shared-cache readers cannot
+            # compile against, so it is written under the exclusive lock too; readers only
+            # wait for the bulk insert into a table they never query
+            with self._tables_lock.writing():
+                conn.execute(f'DROP TABLE IF EXISTS "{staging}"')
+                frame.head(0).to_sql(staging, conn, index=False)
+                conn.commit()
+            frame.to_sql(staging, conn, if_exists='append', index=False)
+            conn.commit()
+            with self._tables_lock.writing():
+                conn.execute('BEGIN')
+                conn.execute(f'DROP TABLE IF EXISTS "{name}"')
+                conn.execute(f'ALTER TABLE "{staging}" RENAME TO "{name}"')
+                conn.commit()
+                self._schemas[name] = {column: frame[column].dtype for column in frame.columns}
+                self._contents[name] = _content_hash(frame)
+                self._loads += 1
+
+    @contextlib.contextmanager
+    def _reading(self):
+        # Connection first: a reader never holds the lock while waiting for the loader's connection
+        with self._pool.connection() as conn, self._tables_lock.reading():
+            yield conn
+
+    @property
+    def version(self):
+        """
+        (token, load count); the token hashes the loaded tables' contents, so
+        backends holding different data never share a version while backends
+        rebuilt from the same data (e.g. in another process) do
+        """
+        token = hashlib.sha256(repr(sorted(self._contents.items())).encode()).hexdigest()
+        return token, self._loads
+
+    def table_version(self, table):
+        """Hash of the table's loaded contents"""
+        if table not in self._contents:
+            raise KeyError(f"Unknown table: {table}")
+        return self._contents[table]
+
+    def _table(self, table):
+        if table not in self._schemas:
+            raise KeyError(f"Unknown table: {table}")
+        return f'"{table}"'
+
+    def _column(self, table, column):
+        self._table(table)
+        if column not in self._schemas[table]:
+            raise KeyError(f"Unknown column {column} in {table}")
+        return f'"{column}"'
+
+    def _where(self, table, filters):
+        clauses, params = [], []
+        for column, value in sorted((filters or {}).items()):
+            if value is None:
+                continue
+            name = self._column(table, column)
+            if isinstance(value, (list, tuple, set)):
+                values = list(value)
+                clauses.append(f"{name} IN ({', '.join('?' * len(values))})" if values else "0")
+                params.extend(values)
+            else:
+                clauses.append(f"{name} = ?")
+                params.append(value)
+        return (f" WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+    def _query(self, table, sql, params):
+        with self._reading() as conn:
+            frame = pd.read_sql_query(sql, conn, params=params)
+        # SQLite has no native boolean or datetime type; restore the loaded dtypes
+        schema = self._schemas[table]
+        for column in frame.columns:
+            dtype = schema.get(column)
+            if dtype is not None and dtype != frame[column].dtype and (
+                pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_datetime64_any_dtype(dtype)
+            ):
+                frame[column] = frame[column].astype(dtype)
+        return frame
+
+    def _order(self, table, order_by, descending):
+        # rowid breaks ties so pages of a sorted result never overlap
+        if order_by is None:
+            return " ORDER BY rowid"
+        return f" ORDER BY {self._column(table, order_by)} {'DESC' if descending else 'ASC'}, rowid"
+
+    def select(self, table, columns=None, filters=None, order_by=None, descending=False,
+               limit=None, offset=None):
+        """Rows of table matching filters, optionally sorted and windowed (top-N, pages)"""
+        selected = ', '.join(self._column(table, c) for c in columns) if columns else '*'
+        where, params = self._where(table, filters)
+        sql = f'SELECT {selected} FROM {self._table(table)}{where}{self._order(table, order_by, descending)}'
+        if limit is not None or offset is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([-1 if limit is None else int(limit), int(offset or 0)])
+        return self._query(table, sql, params)
+
+    def count(self, table, filters=None):
+        """Number of rows matching filters"""
+        where, params = self._where(table, filters)
+        with self._reading() as conn:
+            return conn.execute(f'SELECT COUNT(*) FROM {self._table(table)}{where}', params).fetchone()[0]
+
+    def position(self, table, column, value, filters=None, order_by=None, descending=False):
+        """Zero-based position of the first row whose column equals value, or None"""
+        name = self._column(table, column)
+        where, params = self._where(table, filters)
+        sql = (f'SELECT position FROM (SELECT {name} AS item, '
+               f'ROW_NUMBER() OVER ({self._order(table, order_by, descending).strip()}) - 1 AS position '
+               f'FROM "{table}"{where}) WHERE item = ? ORDER BY position LIMIT 1')
+        with self._reading() as conn:
+            row = conn.execute(sql, params + [value]).fetchone()
+        return None if row is None else row[0]
+
+    def distinct(self, table, column, filters=None):
+        """Distinct values of column in first-seen order"""
+        name = self._column(table, column)
+        where, params = self._where(table, filters)
+        sql = f'SELECT {name} FROM "{table}"{where} GROUP BY {name} ORDER BY MIN(rowid)'
+        return self._query(table, sql, params)[column].tolist()
+
+    def count_by(self, table, column, filters=None):
+        """Row counts per value of column, largest first, like Series.value_counts"""
+        name = self._column(table, column)
+        where, params = self._where(table, filters)
+        sql = (f'SELECT {name}, COUNT(*) AS "count" FROM "{table}"{where} '
+               f'GROUP BY {name} ORDER BY "count" DESC, MIN(rowid)')
+        return self._query(table, sql, params).set_index(column)['count']
+
+
+BACKENDS = {
+    'sqlite': SQLiteBackend,
+}
+
+
+def create_backend(engine=None, **options):
+    """Instantiate the configured backend; the warehouse plugs in here when available"""
+    engine = engine or DATA_BACKEND_CONFIG["engine"]
+    if engine not in BACKENDS:
+        raise ValueError(f"Unknown data backend: {engine}")
+    return BACKENDS[engine](**options)
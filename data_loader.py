@@ -3,44 +3,75 @@ Data loading utilities for the Cultural Tourism Dashboard
 Handles sample data and future integration with real data sources
 """
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 from datetime import datetime, timedelta
+import os
 import random
-from config import SAMPLE_DATA_CONFIG, TOURISM_METRICS
+import sqlite3
+from config import SAMPLE_DATA_CONFIG, TOURISM_METRICS, TIMESERIES_CONFIG, IMPORT_CONFIG
+from timeseries_store import TimeSeriesStore
+from forecasting import SeasonalForecaster
+from cache_governor import governed_cache, governor
+from data_backend import create_backend
+from bulk_importer import database_version
+import snapshots
 
-@st.cache_data(ttl=SAMPLE_DATA_CONFIG["data_refresh_interval"])
+# Seasonal patterns based on actual tourism trends, January to December
+SEASONAL_MULTIPLIERS = [1.2, 1.3, 1.4, 1.1, 0.8, 0.6, 0.5, 0.6, 0.9, 1.5, 1.7, 1.8]
+
+def _imported_table(table):
+    """Rows imported by bulk_importer.py into table, or None when nothing has been imported"""
+    path = IMPORT_CONFIG["database"]
+    if not os.path.exists(path):
+        return None
+    with sqlite3.connect(f"file:{path}?mode=ro", uri=True) as conn:
+        exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                              (table,)).fetchone()
+        df = pd.read_sql_query(f'SELECT * FROM "{table}"', conn) if exists else None
+    return df if df is not None and len(df) else None
+
+@governed_cache(ttl=SAMPLE_DATA_CONFIG["data_refresh_interval"], depends_on=database_version)
 def load_government_tourism_stats():
     """
-    Load tourism statistics - currently using sample data
+    Load tourism statistics - imported releases when available, otherwise sample data
     In production, this would connect to data.gov.in APIs
     """
     
-    # Generate realistic monthly data for 2023
-    months = pd.date_range('2023-01', periods=12, freq='M')
+    imported = _imported_table('tourism_stats')
+    if imported is not None:
+        imported['month'] = pd.to_datetime(imported['month'])
+        return imported.sort_values('month').reset_index(drop=True)
     
-    # Seasonal patterns based on actual tourism trends
-    seasonal_multipliers = [1.2, 1.3, 1.4, 1.1, 0.8, 0.6, 0.5, 0.6, 0.9, 1.5, 1.7, 1.8]
+    # Generate realistic monthly data for 2023
+    months = pd.date_range('2023-01', periods=12, freq='MS')
     base_domestic = 150000000  # Monthly base
     base_international = 800000  # Monthly base
     
     tourism_stats = pd.DataFrame({
         'month': months,
-        'domestic_tourists': [int(base_domestic * mult) for mult in seasonal_multipliers],
-        'international_tourists': [int(base_international * mult) for mult in seasonal_multipliers],
-        'revenue_crores': [int(base_domestic * mult * 0.002) for mult in seasonal_multipliers],
-        'hotel_occupancy': [min(95, max(35, 60 + mult * 15)) for mult in seasonal_multipliers]
+        'domestic_tourists': [int(base_domestic * mult) for mult in SEASONAL_MULTIPLIERS],
+        'international_tourists': [int(base_international * mult) for mult in SEASONAL_MULTIPLIERS],
+        'revenue_crores': [int(base_domestic * mult * 0.002) for mult in SEASONAL_MULTIPLIERS],
+        'hotel_occupancy': [min(95, max(35, 60 + mult * 15)) for mult in SEASONAL_MULTIPLIERS]
     })
     
     return tourism_stats
 
-@st.cache_data
+@governed_cache(depends_on=database_version)
 def load_cultural_heritage_sites():
     """
     Load cultural heritage sites data
-    Based on ASI and UNESCO data
+    Based on ASI and UNESCO data; imported releases replace the sample list
     """
     
+    imported = _imported_table('heritage_sites')
+    if imported is not None:
+        imported['unesco_status'] = imported['unesco_status'].fillna(0).astype(bool)
+        imported['annual_visitors_2023'] = imported['annual_visitors_2023'].fillna(0).astype(int)
+        return imported
+    
     sites_data = {
         'site_name': [
             'Taj Mahal', 'Red Fort', 'Qutub Minar', 'Humayun Tomb', 'Agra Fort',
@@ -89,7 +120,9 @@ def load_cultural_heritage_sites():
     df = pd.DataFrame(sites_data)
     
     # Add synthetic visitor data and coordinates
-    df['annual_visitors_2023'] = [random.randint(100000, 8000000) for _ in range(len(df))]
+    # Seeded so every process (dashboard, API workers) sees the same sample numbers
+    rng = random.Random(2023)
+    df['annual_visitors_2023'] = [rng.randint(100000, 8000000) for _ in range(len(df))]
     df['latitude'] = [
         27.1751, 28.6562, 28.5244, 28.5933, 27.1767,
         20.5519, 20.0269, 18.9633, 18.9398, 16.0000,
@@ -115,13 +148,15 @@ def load_cultural_heritage_sites():
     
     return df
 
-@st.cache_data
+@governed_cache(depends_on=database_version)
 def load_traditional_arts():
     """
     Load traditional arts and crafts data
+    Imported releases replace the sample list
     """
     
-    arts_data = {
+    imported = _imported_table('traditional_arts')
+    arts_data = imported if imported is not None else {
         'art_form': [
             'Bharatanatyam', 'Kathak', 'Kathakali', 'Kuchipudi', 'Odissi', 'Manipuri', 'Mohiniyattam', 'Sattriya',
             'Madhubani', 'Warli', 'Pattachitra', 'Kalamkari', 'Tanjore Painting', 'Mysore Painting',
@@ -165,6 +200,10 @@ def load_traditional_arts():
     }
     
     df = pd.DataFrame(arts_data)
+    if imported is not None:
+        # Releases may leave the optional counts blank
+        counts = ['practitioners_estimated', 'tourism_integration']
+        df[counts] = df[counts].fillna(0).astype(int)
     
     # Add preservation status based on practitioners and tourism integration
     def get_preservation_status(practitioners, tourism):
@@ -184,6 +223,177 @@ def load_traditional_arts():
     
     return df
 
+@governed_cache(depends_on=database_version)
+def load_destination_scores():
+    """
+    Load tourism potential factors per heritage site
+    Columns expected by utils.identify_untapped_destinations; saturation is
+    derived from visitor numbers, the other ratings are sample values
+    """
+    
+    sites = load_cultural_heritage_sites()
+    rng = np.random.default_rng(2023)
+    
+    scores = sites[['site_name', 'state', 'type', 'unesco_status']].copy()
+    scores['annual_visitors'] = sites['annual_visitors_2023']
+    scores['cultural_significance'] = np.where(sites['unesco_status'], 90, 70) + rng.integers(-10, 10, len(sites))
+    scores['infrastructure_rating'] = rng.integers(40, 95, len(sites))
+    scores['accessibility_score'] = rng.integers(35, 95, len(sites))
+    scores['tourism_saturation'] = (sites['annual_visitors_2023'].rank(pct=True) * 100).round(1)
+    
+    return scores
+
+@governed_cache
+def load_sample_data():
+    """
+    Load the dashboard's page tables (art forms, tourism, cultural sites, schemes)
+    Sample data - in production, this would come from Snowflake
+    """
+    
+    # Enhanced sample data that mimics real government data structure
+    art_forms = pd.DataFrame({
+        'name': ['Kathakali', 'Bharatanatyam', 'Madhubani', 'Warli', 'Pattachitra', 
+                 'Kuchipudi', 'Odissi', 'Dhokra', 'Chau Dance', 'Puppetry',
+                 'Kalaripayattu', 'Theyyam', 'Yakshagana', 'Lavani', 'Giddha'],
+        'state': ['Kerala', 'Tamil Nadu', 'Bihar', 'Maharashtra', 'Odisha', 
+                  'Andhra Pradesh', 'Odisha', 'West Bengal', 'Jharkhand', 'Rajasthan',
+                  'Kerala', 'Kerala', 'Karnataka', 'Maharashtra', 'Punjab'],
+        'category': ['Dance', 'Dance', 'Painting', 'Painting', 'Painting', 
+                     'Dance', 'Dance', 'Craft', 'Dance', 'Performance',
+                     'Martial Art', 'Ritual', 'Theatre', 'Dance', 'Dance'],
+        'tourism_score': [85, 90, 70, 65, 75, 80, 78, 60, 55, 88, 72, 68, 82, 77, 71],
+        'preservation_status': ['Good', 'Excellent', 'Fair', 'Fair', 'Good', 
+                               'Good', 'Good', 'At Risk', 'At Risk', 'Good',
+                               'Good', 'At Risk', 'Good', 'Fair', 'Good'],
+        'practitioners': [5000, 15000, 8000, 3000, 4500, 7000, 6000, 1200, 800, 12000,
+                         2000, 500, 3500, 9000, 6500],
+        'govt_support': ['High', 'High', 'Medium', 'Low', 'Medium', 'High', 'High', 
+                        'Low', 'Low', 'High', 'Medium', 'Low', 'Medium', 'Medium', 'Medium']
+    })
+    
+    # Tourism data with more realistic patterns
+    dates = pd.date_range('2023-01', periods=12, freq='MS')
+    tourism_data = pd.DataFrame({
+        'month': dates,
+        'domestic_tourists': [4500000, 4800000, 5200000, 4200000, 3800000, 2800000, 
+                             2500000, 2700000, 3800000, 5500000, 6200000, 6800000],
+        'international_tourists': [120000, 140000, 160000, 110000, 80000, 45000, 
+                                  35000, 40000, 85000, 180000, 220000, 250000],
+        'revenue_crores': [2800, 3200, 3600, 2900, 2400, 1800, 1600, 1700, 2500, 3800, 4200, 4600]
+    })
+    
+    # Expanded cultural sites data
+    cultural_sites = pd.DataFrame({
+        'site': ['Ajanta Caves', 'Hampi', 'Khajuraho', 'Konark Temple', 'Mysore Palace', 
+                 'Red Fort', 'Qutub Minar', 'Taj Mahal', 'Sanchi Stupa', 'Ellora Caves',
+                 'Mahabalipuram', 'Fatehpur Sikri', 'Agra Fort', 'Humayun Tomb'],
+        'state': ['Maharashtra', 'Karnataka', 'Madhya Pradesh', 'Odisha', 'Karnataka', 
+                  'Delhi', 'Delhi', 'Uttar Pradesh', 'Madhya Pradesh', 'Maharashtra',
+                  'Tamil Nadu', 'Uttar Pradesh', 'Uttar Pradesh', 'Delhi'],
+        'visitors_2023': [580000, 420000, 380000, 320000, 750000, 820000, 680000, 
+                         1200000, 180000, 650000, 450000, 380000, 890000, 420000],
+        'lat': [20.5519, 15.3350, 24.8318, 19.8876, 12.3051, 28.6562, 28.5244, 
+                27.1751, 23.4793, 20.0269, 12.6208, 27.0945, 27.1767, 28.5933],
+        'lon': [75.7033, 76.4601, 79.9199, 86.0945, 76.6551, 77.2410, 77.1855, 
+                78.0421, 77.7398, 75.1789, 80.1982, 77.5619, 78.0081, 77.2507],
+        'unesco_status': ['Yes', 'Yes', 'Yes', 'Yes', 'No', 'Yes', 'Yes', 'Yes', 
+                         'Yes', 'Yes', 'Yes', 'Yes', 'Yes', 'Yes'],
+        'type': ['Cave', 'Ruins', 'Temple', 'Temple', 'Palace', 'Fort', 'Monument', 
+                'Mausoleum', 'Stupa', 'Cave', 'Temple', 'City', 'Fort', 'Tomb']
+    })
+    
+    # Government schemes data (based on actual schemes)
+    govt_schemes = pd.DataFrame({
+        'scheme': ['Swadesh Darshan 2.0', 'PRASHAD', 'Adopt a Heritage', 'Dekho Apna Desh'],
+        'budget_crores': [5000, 1200, 0, 800],
+        'sites_covered': [134, 56, 95, 0],
+        'focus_area': ['Theme Circuits', 'Pilgrimage Sites', 'Monument Conservation', 'Domestic Tourism'],
+        'launch_year': [2014, 2014, 2017, 2020],
+        'ministry': ['Tourism', 'Tourism', 'Tourism & Culture', 'Tourism']
+    })
+    
+    return art_forms, tourism_data, cultural_sites, govt_schemes
+
+@st.cache_resource
+def load_data_backend():
+    """
+    Load the page tables into the query backend
+    Local query engine standing in for the warehouse; pages push filters down to it
+    """
+    
+    backend = create_backend()
+    tables = ['art_forms', 'tourism_data', 'cultural_sites', 'govt_schemes']
+    for name, frame in zip(tables, load_sample_data()):
+        backend.load_table(name, frame)
+    return backend
+
+def load_site_arrivals():
+    """
+    Load daily arrivals per heritage site into the time-series store
+    Synthetic history following the seasonal pattern with yearly growth,
+    ingested one year at a time the way monthly releases would be appended;
+    rebuilt whenever new heritage sites are imported
+    """
+    
+    return _site_arrivals(database_version())
+
+# Only the store for the current imports is kept; its memory counts against the cache budget
+@st.cache_resource(ttl=SAMPLE_DATA_CONFIG["data_refresh_interval"], max_entries=1)
+def _site_arrivals(imports_version):
+    store = snapshots.get('site_arrivals') or _build_site_arrivals()
+    governor.track('site_arrivals', store)
+    return store
+
+def _build_site_arrivals():
+    sites = load_cultural_heritage_sites()
+    store = TimeSeriesStore()
+    rng = np.random.default_rng(2023)
+    
+    start = pd.Timestamp(TIMESERIES_CONFIG["history_start"])
+    end = pd.Timestamp(TIMESERIES_CONFIG["history_end"])
+    international_share = TIMESERIES_CONFIG["international_share"]
+    seasonal = np.array(SEASONAL_MULTIPLIERS) / np.mean(SEASONAL_MULTIPLIERS)
+    
+    # Imported releases may list the same site name in several states
+    labels = sites['site_name'].where(~sites['site_name'].duplicated(keep=False),
+                                      sites['site_name'] + ' (' + sites['state'] + ')')
+    
+    for year in range(start.year, end.year + 1):
+        days = pd.date_range(max(start, pd.Timestamp(year, 1, 1)),
+                             min(end, pd.Timestamp(year, 12, 31)), freq='D')
+        # Visitor numbers are for 2023; earlier years scale back at ~8% annual growth
+        growth = 1.08 ** (year - 2023)
+        pattern = seasonal[days.month - 1] * growth / 365
+        
+        for label, (_, site) in zip(labels, sites.iterrows()):
+            expected = site['annual_visitors_2023'] * pattern
+            daily = rng.poisson(expected * rng.uniform(0.85, 1.15, len(days)))
+            international = rng.binomial(daily, international_share)
+            store.append(label, site['state'], days[0], {
+                'domestic_tourists': daily - international,
+                'international_tourists': international
+            })
+    
+    return store
+
+@st.cache_resource
+def _arrival_forecaster():
+    return snapshots.get('arrival_forecaster') or SeasonalForecaster()
+
+def load_arrival_forecasts():
+    """
+    Load 12-month arrival projections for every site, state and the country
+    The forecaster lives across reruns and only refits when the arrivals
+    store has a new data version
+    """
+    
+    forecaster = _arrival_forecaster()
+    version = forecaster.version
+    forecaster.refresh(load_site_arrivals())
+    if forecaster.version != version:
+        governor.track('arrival_forecaster', forecaster)
+    return forecaster
+
 def get_data_sources_info():
     """
     Return information about data sources
@@ -0,0 +1,149 @@
+"""
+Dependency-graph evaluation for derived dashboard data
+Datasets, derived frames and figures are nodes with declared inputs. Each node
+is fingerprinted from its code and its inputs' fingerprints, and results are
+memoized in the cache governor under that fingerprint, so a rerun recomputes
+only the nodes whose inputs actually changed
+"""
+
+import hashlib
+import pickle
+import time
+import types
+
+import numpy as np
+import pandas as pd
+import snapshots
+from cache_governor import governor, MISSING
+
+
+def fingerprint(value):
+    """Content hash of a run input; objects with a version attribute are hashed by it"""
+    digest = hashlib.sha256()
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        try:
+            digest.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+        except TypeError:
+            # Cells holding unhashable objects such as lists
+            digest.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        columns = value.columns if isinstance(value, pd.DataFrame) else [value.name]
+        digest.update(repr((list(columns), [str(t) for t in np.atleast_1d(value.dtypes)])).encode())
+    elif isinstance(value, np.ndarray):
+        digest.update(repr((value.shape, value.dtype.str)).encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif hasattr(value, 'version'):
+        # Stores and backends are shared objects whose version carries an instance
+        # token and changes on every update
+        digest.update(repr((type(value).__qualname__, value.version)).encode())
+    else:
+        try:
+            digest.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except (pickle.PicklingError, TypeError, AttributeError):
+            digest.update(repr(value).encode())
+    return digest.hexdigest()
+
+
+def _code_hash(code):
+    """Hash of a code object's bytecode, constants and names, identical in every process"""
+    digest = hashlib.sha256(code.co_code)
+    # Bytecode refers to called functions, attributes and locals by index into these
+    digest.update(repr((code.co_names, code.co_varnames, code.co_freevars)).encode())
+    for const in code.co_consts:
+        # Nested code objects (comprehensions, lambdas) repr with their memory address
+        digest.update((_code_hash(const) if isinstance(const, types.CodeType) else repr(const)).encode())
+    return digest.hexdigest()
+
+
+class _Node:
+    __slots__ = ('name', 'func', 'inputs', 'code')
+
+    def __init__(self, name, func, inputs):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        # Editing a node's code invalidates its memoized results
+        self.code = _code_hash(func.__code__)
+
+
+class Dataflow:
+    """
+    A named graph of derived nodes
+
+    Declare nodes with the node decorator, then call evaluate() with the run's
+    inputs (source tables, filter values, shared stores) and read nodes from
+    the returned Run. Node results are shared between runs and sessions, so
+    node functions and their callers must not mutate them.
+    """
+
+    def __init__(self, name, cache=None):
+        self.name = name
+        self.cache = cache or governor
+        self.nodes = {}
+
+    def node(self, inputs=(), name=None):
+        def register(func):
+            node_name = name or func.__name__
+            if node_name in self.nodes:
+                raise ValueError(f"Node {node_name} is already defined in {self.name}")
+            self.nodes[node_name] = _Node(node_name, func, inputs)
+            return func
+        return register
+
+    def evaluate(self, **inputs):
+        return Run(self, inputs)
+
+
+class Run:
+    """One evaluation of a Dataflow; nodes are computed lazily on first access"""
+
+    def __init__(self, flow, inputs):
+        self.flow = flow
+        self.inputs = inputs
+        self.recomputed = []
+        self.reused = []
+        self._fingerprints = {}
+        self._values = {}
+
+    def fingerprint(self, name):
+        if name not in self._fingerprints:
+            if name in self.inputs:
+                self._fingerprints[name] = fingerprint(self.inputs[name])
+            elif name in self.flow.nodes:
+                node = self.flow.nodes[name]
+                parts = [node.name, node.code] + [self.fingerprint(i) for i in node.inputs]
+                self._fingerprints[name] = hashlib.sha256('|'.join(parts).encode()).hexdigest()
+            else:
+                raise KeyError(f"{name} is neither an input nor a node of {self.flow.name}")
+        return self._fingerprints[name]
+
+    def computable(self, name):
+        """Whether name is an input or a node whose inputs this run can all supply"""
+        if name in self.inputs:
+            return True
+        node = self.flow.nodes.get(name)
+        return node is not None and all(self.computable(i) for i in node.inputs)
+
+    def __getitem__(self, name):
+        if name in self.inputs:
+            return self.inputs[name]
+        if name not in self._values:
+            node = self.flow.nodes.get(name)
+            if node is None:
+                raise KeyError(f"{name} is neither an input nor a node of {self.flow.name}")
+            key = ('dataflow', self.flow.name, name, self.fingerprint(name))
+            value = self.flow.cache.get(key)
+            warm = snapshots.get(key) if value is MISSING else None
+            if warm is not None:
+                value, cost = warm
+                self.flow.cache.put(key, value, cost=cost)
+                self.reused.append(name)
+            elif value is MISSING:
+                arguments = [self[i] for i in node.inputs]
+                started = time.perf_counter()
+                value = node.func(*arguments)
+                self.flow.cache.put(key, value, cost=time.perf_counter() - started)
+                self.recomputed.append(name)
+            else:
+                self.reused.append(name)
+            self._values[name] = value
+        return self._values[name]
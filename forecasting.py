@@ -0,0 +1,232 @@
+"""
+Seasonal forecasting of monthly tourist arrivals
+Fits additive Holt-Winters models to every site, state and national series at
+once, with NumPy operating across series, and keeps the fitted state so new
+months are absorbed incrementally instead of refitting from scratch
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+from config import FORECAST_CONFIG
+
+
+def _initial_state(values, season_length):
+    """Level, trend and seasonal components estimated from the first two seasons"""
+    first = values[:, :season_length]
+    second = values[:, season_length:2 * season_length]
+    level = first.mean(axis=1)
+    trend = (second.mean(axis=1) - level) / season_length
+    season = first - level[:, None]
+    return level, trend, season
+
+
+def _holt_winters(values, level, trend, season, alpha, beta, gamma, phase):
+    """
+    Run the additive Holt-Winters recursion over the columns of values
+
+    State arrays broadcast over any leading axes, so the same loop scores a
+    grid of smoothing weights (grid, series) or advances fitted series
+    (series,). season is updated in place; phase is the seasonal slot of the
+    first column. Returns the new level, trend and one-step-ahead SSE.
+    """
+    season_length = season.shape[-1]
+    sse = np.zeros(np.broadcast(level, alpha).shape)
+    for t in range(values.shape[1]):
+        y = values[:, t]
+        slot = (phase + t) % season_length
+        seasonal = season[..., slot]
+        error = y - (level + trend + seasonal)
+        sse += error ** 2
+        new_level = alpha * (y - seasonal) + (1 - alpha) * (level + trend)
+        trend = beta * (new_level - level) + (1 - beta) * trend
+        level = new_level
+        season[..., slot] = gamma * (y - level) + (1 - gamma) * seasonal
+    return level, trend, sse
+
+
+def seasonal_naive(values, horizon, season_length):
+    """Repeat the last season, shifted by the average monthly drift, for short histories"""
+    steps = np.arange(horizon)
+    periods = values.shape[1]
+    if periods < season_length:
+        return np.repeat(values.mean(axis=1, keepdims=True), horizon, axis=1)
+    # Year-over-year differences compare like months, so the seasonal swing is not read as trend
+    if periods > season_length:
+        drift = (values[:, season_length:] - values[:, :-season_length]).mean(axis=1) / season_length
+    else:
+        drift = np.zeros(values.shape[0])
+    last_season = values[:, periods - season_length:]
+    cycles = steps // season_length + 1
+    return last_season[:, steps % season_length] + drift[:, None] * season_length * (cycles - 1)
+
+
+class _Fit:
+    """Everything a projection reads, replaced as a whole so readers never see a mix"""
+
+    __slots__ = ('keys', 'index', 'months', 'state', 'params', 'history', 'since_refit')
+
+    def __init__(self, keys, months, state=None, params=None, history=None, since_refit=0):
+        self.keys = keys
+        self.index = {key: row for row, key in enumerate(keys)}
+        self.months = months
+        self.state = state
+        self.params = params
+        self.history = history
+        self.since_refit = since_refit
+
+
+class SeasonalForecaster:
+    """
+    Batch Holt-Winters forecaster for many monthly series
+
+    fit() picks per-series smoothing weights from a small grid; update()
+    advances the fitted state over newly arrived months with those weights,
+    refitting only when the series set changes or refit_every months have
+    been absorbed. Histories shorter than two seasons fall back to a
+    seasonal-naive forecast with drift.
+    """
+
+    def __init__(self, season_length=None, horizon=None, smoothing_grid=None, refit_every=None):
+        self.season_length = season_length or FORECAST_CONFIG["season_length"]
+        self.horizon = horizon or FORECAST_CONFIG["horizon"]
+        self.smoothing_grid = smoothing_grid or FORECAST_CONFIG["smoothing_grid"]
+        self.refit_every = refit_every or FORECAST_CONFIG["refit_every"]
+        self.version = None
+        self._fit = _Fit([], pd.DatetimeIndex([]))
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def keys(self):
+        return self._fit.keys
+
+    @property
+    def months(self):
+        return self._fit.months
+
+    def fit(self, keys, months, values):
+        """Fit every series (rows of values, one column per month) from scratch"""
+        values = np.asarray(values, dtype='float64')
+        keys, months = list(keys), pd.DatetimeIndex(months)
+
+        if values.shape[1] < 2 * self.season_length:
+            self._fit = _Fit(keys, months, history=values)
+            return self
+
+        weights = np.asarray(self.smoothing_grid, dtype='float64')
+        grids = np.meshgrid(weights, weights, weights, indexing='ij')
+        alpha, beta, gamma = (grid.reshape(-1, 1) for grid in grids)
+        level, trend, season = _initial_state(values, self.season_length)
+        grid_size = len(alpha)
+        grid_season = np.broadcast_to(season, (grid_size,) + season.shape).copy()
+        level, trend, sse = _holt_winters(
+            values, np.broadcast_to(level, (grid_size, len(level))),
+            np.broadcast_to(trend, (grid_size, len(trend))), grid_season,
+            alpha, beta, gamma, phase=0
+        )
+
+        best = sse.argmin(axis=0)
+        rows = np.arange(values.shape[0])
+        self._fit = _Fit(keys, months,
+                         state=(level[best, rows], trend[best, rows], grid_season[best, rows]),
+                         params=(alpha[best, 0], beta[best, 0], gamma[best, 0]))
+        return self
+
+    def update(self, keys, months, values):
+        """Absorb newly arrived months, refitting only when incremental updating is not possible"""
+        months = pd.DatetimeIndex(months)
+        current = self._fit
+        known = len(current.months)
+        appended = (
+            current.state is not None
+            and list(keys) == current.keys
+            and len(months) >= known
+            and months[:known].equals(current.months)
+        )
+        new_months = len(months) - known
+        if not appended or current.since_refit + new_months >= self.refit_every:
+            return self.fit(keys, months, values)
+        if new_months == 0:
+            return self
+
+        level, trend, season = current.state
+        # The recursion updates season in place; work on a copy readers cannot see
+        season = season.copy()
+        alpha, beta, gamma = current.params
+        fresh = np.asarray(values, dtype='float64')[:, known:]
+        level, trend, _ = _holt_winters(
+            fresh, level, trend, season, alpha, beta, gamma,
+            phase=known % self.season_length
+        )
+        self._fit = _Fit(current.keys, months, state=(level, trend, season), params=current.params,
+                         since_refit=current.since_refit + new_months)
+        return self
+
+    def refresh(self, store):
+        """
+        Bring forecasts in line with a TimeSeriesStore, doing nothing if its version is unchanged
+
+        A store's version includes its instance token, so a rebuilt store is
+        never mistaken for the one already modelled.
+        """
+        with self._lock:
+            if store.version == self.version:
+                return self
+            keys, months, values = store.rollup_matrix('month')
+            totals = values.sum(axis=2)
+
+            # Only complete months are modelled; a partial trailing month would look like a slump
+            _, last_day = store.date_range()
+            if last_day is not None and (last_day + pd.Timedelta(days=1)).day != 1:
+                complete = months < last_day.replace(day=1)
+                months, totals = months[complete], totals[:, complete]
+
+            if self.version is not None and self.version[0] == store.token:
+                self.update(keys, months, totals)
+            else:
+                # Another store's history cannot be absorbed incrementally
+                self.fit(keys, months, totals)
+            self.version = store.version
+            return self
+
+    def _future_months(self, fit):
+        if len(fit.months) == 0:
+            return pd.DatetimeIndex([], name='period')
+        return pd.date_range(fit.months[-1], periods=self.horizon + 1, freq='MS', name='period')[1:]
+
+    def future_months(self):
+        return self._future_months(self._fit)
+
+    def _project(self, fit, rows=slice(None)):
+        if fit.state is None:
+            if fit.history is None:
+                return np.zeros((0, self.horizon))
+            projected = seasonal_naive(fit.history[rows], self.horizon, self.season_length)
+        else:
+            level, trend, season = (part[rows] for part in fit.state)
+            steps = np.arange(1, self.horizon + 1)
+            slots = (len(fit.months) + steps - 1) % self.season_length
+            projected = level[:, None] + trend[:, None] * steps + season[:, slots]
+        return np.clip(projected, 0, None)
+
+    def forecast(self):
+        """Projections for every series as an array shaped (series, horizon)"""
+        return self._project(self._fit)
+
+    def projection(self, key):
+        """Projected monthly arrivals for one (scope, name) series"""
+        # Read one fitted state throughout, even if a refresh swaps in another meanwhile
+        fit = self._fit
+        row = fit.index[key]
+        return pd.Series(self._project(fit, slice(row, row + 1))[0],
+                         index=self._future_months(fit), name='forecast')
@@ -0,0 +1,69 @@
+"""
+Warm-start snapshots of datasets and derived indexes
+run_app.py builds every dataset once before the dashboard starts and saves
+them here; loaders read the snapshot on their first call instead of
+rebuilding, so the first visitor does not pay for data preparation. A
+snapshot is only valid for the imports database it was built from
+"""
+
+import os
+import pickle
+import threading
+import time
+
+from bulk_importer import database_version
+from config import SAMPLE_DATA_CONFIG, WARM_START_CONFIG
+
+_lock = threading.Lock()
+_loaded = None
+
+
+def save(values, path=None):
+    """Write values (name -> object) as the current snapshot, replacing any previous one"""
+    path = path or WARM_START_CONFIG["snapshot_path"]
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temporary = f"{path}.tmp"
+    with open(temporary, 'wb') as f:
+        pickle.dump({'created': time.time(), 'imports_version': database_version(), 'values': values},
+                    f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary, path)
+
+
+def discard(path=None):
+    """Delete the current snapshot and stop serving values from it in this process"""
+    global _loaded
+    path = path or WARM_START_CONFIG["snapshot_path"]
+    with _lock:
+        _loaded = {}
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _load(path):
+    try:
+        with open(path, 'rb') as f:
+            snapshot = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return {}
+    # Sample data is regenerated every refresh interval; older snapshots are ignored
+    if time.time() - snapshot['created'] > SAMPLE_DATA_CONFIG["data_refresh_interval"]:
+        return {}
+    # So are snapshots taken before the latest import
+    if snapshot.get('imports_version') != database_version():
+        return {}
+    return snapshot['values']
+
+
+def get(name, default=None):
+    """
+    Value saved under name in the snapshot, read from disk once per process
+
+    Each value is handed out once; after that the caller's cache owns it.
+    """
+    global _loaded
+    with _lock:
+        if _loaded is None:
+            _loaded = _load(WARM_START_CONFIG["snapshot_path"])
+        return _loaded.pop(name, default)
@@ -5,6 +5,11 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import requests
 import json
+from config import TIMESERIES_CONFIG
+from data_loader import load_site_arrivals, load_arrival_forecasts, load_data_backend
+from cache_governor import governor
+from components import paginated_details
+from dashboard_graph import flow, table_inputs
 
 # Page configuration
 st.set_page_config(
@@ -50,75 +55,8 @@ page = st.sidebar.radio(
      "Tourism Analytics", "Responsible Tourism", "Data Insights"]
 )
 
-# Sample data - In production, this would come from Snowflake
-@st.cache_data
-def load_sample_data():
-    # Enhanced sample data that mimics real government data structure
-    art_forms = pd.DataFrame({
-        'name': ['Kathakali', 'Bharatanatyam', 'Madhubani', 'Warli', 'Pattachitra', 
-                 'Kuchipudi', 'Odissi', 'Dhokra', 'Chau Dance', 'Puppetry',
-                 'Kalaripayattu', 'Theyyam', 'Yakshagana', 'Lavani', 'Giddha'],
-        'state': ['Kerala', 'Tamil Nadu', 'Bihar', 'Maharashtra', 'Odisha', 
-                  'Andhra Pradesh', 'Odisha', 'West Bengal', 'Jharkhand', 'Rajasthan',
-                  'Kerala', 'Kerala', 'Karnataka', 'Maharashtra', 'Punjab'],
-        'category': ['Dance', 'Dance', 'Painting', 'Painting', 'Painting', 
-                     'Dance', 'Dance', 'Craft', 'Dance', 'Performance',
-                     'Martial Art', 'Ritual', 'Theatre', 'Dance', 'Dance'],
-        'tourism_score': [85, 90, 70, 65, 75, 80, 78, 60, 55, 88, 72, 68, 82, 77, 71],
-        'preservation_status': ['Good', 'Excellent', 'Fair', 'Fair', 'Good', 
-                               'Good', 'Good', 'At Risk', 'At Risk', 'Good',
-                               'Good', 'At Risk', 'Good', 'Fair', 'Good'],
-        'practitioners': [5000, 15000, 8000, 3000, 4500, 7000, 6000, 1200, 800, 12000,
-                         2000, 500, 3500, 9000, 6500],
-        'govt_support': ['High', 'High', 'Medium', 'Low', 'Medium', 'High', 'High', 
-                        'Low', 'Low', 'High', 'Medium', 'Low', 'Medium', 'Medium', 'Medium']
-    })
-    
-    # Tourism data with more realistic patterns
-    dates = pd.date_range('2023-01', periods=12, freq='M')
-    tourism_data = pd.DataFrame({
-        'month': dates,
-        'domestic_tourists': [4500000, 4800000, 5200000, 4200000, 3800000, 2800000, 
-                             2500000, 2700000, 3800000, 5500000, 6200000, 6800000],
-        'international_tourists': [120000, 140000, 160000, 110000, 80000, 45000, 
-                                  35000, 40000, 85000, 180000, 220000, 250000],
-        'revenue_crores': [2800, 3200, 3600, 2900, 2400, 1800, 1600, 1700, 2500, 3800, 4200, 4600]
-    })
-    
-    # Expanded cultural sites data
-    cultural_sites = pd.DataFrame({
-        'site': ['Ajanta Caves', 'Hampi', 'Khajuraho', 'Konark Temple', 'Mysore Palace', 
-                 'Red Fort', 'Qutub Minar', 'Taj Mahal', 'Sanchi Stupa', 'Ellora Caves',
-                 'Mahabalipuram', 'Fatehpur Sikri', 'Agra Fort', 'Humayun Tomb'],
-        'state': ['Maharashtra', 'Karnataka', 'Madhya Pradesh', 'Odisha', 'Karnataka', 
-                  'Delhi', 'Delhi', 'Uttar Pradesh', 'Madhya Pradesh', 'Maharashtra',
-                  'Tamil Nadu', 'Uttar Pradesh', 'Uttar Pradesh', 'Delhi'],
-        'visitors_2023': [580000, 420000, 380000, 320000, 750000, 820000, 680000, 
-                         1200000, 180000, 650000, 450000, 380000, 890000, 420000],
-        'lat': [20.5519, 15.3350, 24.8318, 19.8876, 12.3051, 28.6562, 28.5244, 
-                27.1751, 23.4793, 20.0269, 12.6208, 27.0945, 27.1767, 28.5933],
-        'lon': [75.7033, 76.4601, 79.9199, 86.0945, 76.6551, 77.2410, 77.1855, 
-                78.0421, 77.7398, 75.1789, 80.1982, 77.5619, 78.0081, 77.2507],
-        'unesco_status': ['Yes', 'Yes', 'Yes', 'Yes', 'No', 'Yes', 'Yes', 'Yes', 
-                         'Yes', 'Yes', 'Yes', 'Yes', 'Yes', 'Yes'],
-        'type': ['Cave', 'Ruins', 'Temple', 'Temple', 'Palace', 'Fort', 'Monument', 
-                'Mausoleum', 'Stupa', 'Cave', 'Temple', 'City', 'Fort', 'Tomb']
-    })
-    
-    # Government schemes data (based on actual schemes)
-    govt_schemes = pd.DataFrame({
-        'scheme': ['Swadesh Darshan 2.0', 'PRASHAD', 'Adopt a Heritage', 'Dekho Apna Desh'],
-        'budget_crores': [5000, 1200, 0, 800],
-        'sites_covered': [134, 56, 95, 0],
-        'focus_area': ['Theme Circuits', 'Pilgrimage Sites', 'Monument Conservation', 'Domestic Tourism'],
-        'launch_year': [2014, 2014, 2017, 2020],
-        'ministry': ['Tourism', 'Tourism', 'Tourism & Culture', 'Tourism']
-    })
-    
-    return art_forms, tourism_data, cultural_sites, govt_schemes
-
-# Update the function call
-art_forms, tourism_data, cultural_sites, govt_schemes = load_sample_data()
+# Pages query the backend, so only result-sized data reaches the script
+backend = load_data_backend()
 
 # Home Page
 if page == "Home":
@@ -180,125 +118,127 @@ elif page == "Traditional Art Forms":
     st.title("🎨 Traditional Art Forms of India")
     
     # Filters
+    filter_options = flow.evaluate(**table_inputs(backend))['art_filter_options']
     col1, col2, col3 = st.columns(3)
     with col1:
         category_filter = st.selectbox("Select Category", 
-                                     ["All"] + list(art_forms['category'].unique()))
+                                     ["All"] + filter_options['category'])
     with col2:
         state_filter = st.selectbox("Select State", 
-                                  ["All"] + list(art_forms['state'].unique()))
+                                  ["All"] + filter_options['state'])
     with col3:
         status_filter = st.selectbox("Preservation Status", 
-                                   ["All"] + list(art_forms['preservation_status'].unique()))
+                                   ["All"] + filter_options['preservation_status'])
     
     # Filter data
-    filtered_data = art_forms.copy()
-    if category_filter != "All":
-        filtered_data = filtered_data[filtered_data['category'] == category_filter]
-    if state_filter != "All":
-        filtered_data = filtered_data[filtered_data['state'] == state_filter]
-    if status_filter != "All":
-        filtered_data = filtered_data[filtered_data['preservation_status'] == status_filter]
+    art_filters = {
+        'category': None if category_filter == "All" else category_filter,
+        'state': None if state_filter == "All" else state_filter,
+        'preservation_status': None if status_filter == "All" else status_filter
+    }
+    derived = flow.evaluate(**table_inputs(backend), art_filters=art_filters)
     
     # Visualizations
     col1, col2 = st.columns(2)
     
     with col1:
         # Tourism score chart
-        fig = px.bar(filtered_data, x='name', y='tourism_score', 
-                     color='preservation_status',
-                     title='Tourism Potential Score by Art Form',
-                     color_discrete_map={'Good': '#4CAF50', 'Excellent': '#2196F3', 
-                                       'Fair': '#FFC107', 'At Risk': '#F44336'})
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(derived['tourism_score_figure'], use_container_width=True)
     
     with col2:
         # Category distribution
-        category_counts = filtered_data['category'].value_counts()
-        fig = px.pie(values=category_counts.values, names=category_counts.index,
-                     title='Distribution by Category',
-                     color_discrete_sequence=['#FF6B35', '#F7931E', '#F8B500', '#004643'])
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(derived['category_figure'], use_container_width=True)
     
     # Detailed information
     st.markdown("### 📋 Detailed Information")
-    for idx, row in filtered_data.iterrows():
-        with st.expander(f"{row['name']} - {row['state']}"):
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("Category", row['category'])
-            with col2:
-                st.metric("Tourism Score", f"{row['tourism_score']}/100")
-            with col3:
-                status_color = {'Good': '🟢', 'Excellent': '🔵', 'Fair': '🟡', 'At Risk': '🔴'}
-                st.metric("Status", f"{status_color.get(row['preservation_status'], '⚪')} {row['preservation_status']}")
+    
+    def render_art_form(row):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Category", row['category'])
+        with col2:
+            st.metric("Tourism Score", f"{row['tourism_score']}/100")
+        with col3:
+            status_color = {'Good': '🟢', 'Excellent': '🔵', 'Fair': '🟡', 'At Risk': '🔴'}
+            st.metric("Status", f"{status_color.get(row['preservation_status'], '⚪')} {row['preservation_status']}")
+    
+    paginated_details(backend, 'art_forms', key='art_form_details',
+                      label=lambda row: f"{row['name']} - {row['state']}",
+                      render_item=render_art_form,
+                      filters=art_filters,
+                      sort_options={'Tourism Score': ('tourism_score', True),
+                                    'Name': ('name', False),
+                                    'Practitioners': ('practitioners', True)},
+                      search_column='name')
 
 # Cultural Experiences Page
 elif page == "Cultural Experiences":
     st.title("🗺️ Cultural Experiences Map")
     
+    derived = flow.evaluate(**table_inputs(backend))
+    
     # Interactive map
-    fig = px.scatter_mapbox(cultural_sites, 
-                           lat="lat", 
-                           lon="lon", 
-                           hover_name="site",
-                           hover_data=["state", "visitors_2023"],
-                           size="visitors_2023",
-                           color="visitors_2023",
-                           color_continuous_scale="Viridis",
-                           size_max=30,
-                           zoom=4,
-                           height=600,
-                           title="Major Cultural Sites and Visitor Traffic")
-    
-    fig.update_layout(mapbox_style="open-street-map")
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(derived['site_map_figure'], use_container_width=True)
     
     # Site details
     st.markdown("### 🏛️ Cultural Site Analytics")
     
     # Top sites by visitors
-    top_sites = cultural_sites.nlargest(5, 'visitors_2023')
-    fig = px.bar(top_sites, x='visitors_2023', y='site', orientation='h',
-                 title='Top 5 Most Visited Cultural Sites (2023)',
-                 color='visitors_2023',
-                 color_continuous_scale='Blues')
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(derived['top_sites_figure'], use_container_width=True)
 
 # Tourism Analytics Page
 elif page == "Tourism Analytics":
     st.title("📊 Tourism Analytics Dashboard")
     
     # Time series analysis
-    st.markdown("### 📈 Tourism Trends (2023)")
+    st.markdown("### 📈 Tourism Trends")
     
-    # Prepare data for visualization
-    tourism_data['total_tourists'] = tourism_data['domestic_tourists'] + tourism_data['international_tourists']
+    site_arrivals = load_site_arrivals()
+    first_day, last_day = site_arrivals.date_range()
     
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=tourism_data['month'], y=tourism_data['domestic_tourists'],
-                            name='Domestic Tourists', line=dict(color='#FF6B35', width=3)))
-    fig.add_trace(go.Scatter(x=tourism_data['month'], y=tourism_data['international_tourists'],
-                            name='International Tourists', line=dict(color='#004643', width=3)))
-    fig.add_trace(go.Scatter(x=tourism_data['month'], y=tourism_data['total_tourists'],
-                            name='Total', line=dict(color='#F7931E', width=3, dash='dash')))
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        trend_state = st.selectbox("Region", ["All India"] + site_arrivals.states)
+    with col2:
+        visible_range = st.slider("Visible range",
+                                  min_value=first_day.date(), max_value=last_day.date(),
+                                  value=(first_day.date(), last_day.date()),
+                                  format="MMM YYYY")
+    
+    # Trend reads the pre-materialized rollup that matches the visible range
+    derived = flow.evaluate(
+        site_arrivals=site_arrivals,
+        forecasts=load_arrival_forecasts(),
+        trend_window=(visible_range[0], visible_range[1], TIMESERIES_CONFIG["max_chart_points"]),
+        trend_region=trend_state
+    )
+    st.plotly_chart(derived['arrival_trend_figure'], use_container_width=True)
+    
+    # Seasonal forecast for the selected region
+    st.markdown("### 🔮 12-Month Outlook")
+    st.plotly_chart(derived['outlook_figure'], use_container_width=True)
+    
+    outlook = derived['outlook_summary']
+    projected_visitors = outlook['projected_visitors']
+    projected_impact = outlook['impact']
+    peak_share = outlook['peak_share']
     
-    fig.update_layout(title='Monthly Tourist Arrivals',
-                     xaxis_title='Month',
-                     yaxis_title='Number of Tourists',
-                     height=400)
-    st.plotly_chart(fig, use_container_width=True)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Projected Arrivals", f"{projected_visitors:,}", "Next 12 months")
+    with col2:
+        st.metric("Projected Economic Impact", f"₹{projected_impact['total_economic_impact'] / 1e7:,.0f} Cr")
+    with col3:
+        st.metric("Jobs Supported", f"{projected_impact['jobs_supported']:,}")
     
     # Seasonality insights
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown("### 🌡️ Seasonality Insights")
-        st.info("""
+        st.info(f"""
         **Peak Season (Oct-Mar):** 
-        - 65% of annual tourist arrivals
+        - {peak_share:.0%} of projected tourist arrivals
         - Pleasant weather across most regions
         - Major festivals: Diwali, Durga Puja, Holi
         
@@ -398,27 +338,30 @@ elif page == "Data Insights":
     Our analysis is based on comprehensive data from various government sources:
     """)
     
-    # Use the loaded government schemes data
-    fig = px.bar(govt_schemes, x='scheme', y='budget_crores', 
-                 title='Government Investment in Cultural Tourism Schemes',
-                 color='budget_crores',
-                 color_continuous_scale='Viridis',
-                 text='budget_crores')
-    fig.update_traces(texttemplate='₹%{text} Cr', textposition='outside')
-    st.plotly_chart(fig, use_container_width=True)
+    # Government schemes data from the backend
+    derived = flow.evaluate(**table_inputs(backend))
+    st.plotly_chart(derived['scheme_budget_figure'], use_container_width=True)
 
     # Add scheme details
     st.markdown("### 📋 Government Scheme Details")
-    for idx, scheme in govt_schemes.iterrows():
-        with st.expander(f"{scheme['scheme']} - {scheme['ministry']}"):
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("Budget", f"₹{scheme['budget_crores']} Cr")
-            with col2:
-                st.metric("Sites Covered", scheme['sites_covered'] if scheme['sites_covered'] > 0 else "All States")
-            with col3:
-                st.metric("Launch Year", scheme['launch_year'])
-            st.write(f"**Focus Area:** {scheme['focus_area']}")
+    
+    def render_scheme(scheme):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Budget", f"₹{scheme['budget_crores']} Cr")
+        with col2:
+            st.metric("Sites Covered", scheme['sites_covered'] if scheme['sites_covered'] > 0 else "All States")
+        with col3:
+            st.metric("Launch Year", scheme['launch_year'])
+        st.write(f"**Focus Area:** {scheme['focus_area']}")
+    
+    paginated_details(backend, 'govt_schemes', key='scheme_details',
+                      label=lambda scheme: f"{scheme['scheme']} - {scheme['ministry']}",
+                      render_item=render_scheme,
+                      sort_options={'Budget': ('budget_crores', True),
+                                    'Launch Year': ('launch_year', True),
+                                    'Scheme': ('scheme', False)},
+                      search_column='scheme')
     
     # Key findings
     col1, col2 = st.columns(2)
@@ -453,6 +396,23 @@ elif page == "Data Insights":
     **Note**: This dashboard uses sample data for demonstration. In production, 
     it would connect to Snowflake for real-time government data integration.
     """)
+    
+    # Cache memory usage
+    with st.expander("⚙️ Cache Usage"):
+        usage = governor.usage()
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Memory Used", f"{usage['used_bytes'] / 1024 ** 2:.1f} MB",
+                      f"of {usage['budget_bytes'] / 1024 ** 2:.0f} MB budget", delta_color="off")
+        with col2:
+            st.metric("Cached Entries", usage['entries'], f"{usage['spilled_entries']} spilled to disk", delta_color="off")
+        with col3:
+            hit_rate = usage['hits'] / max(usage['hits'] + usage['misses'], 1)
+            st.metric("Hit Rate", f"{hit_rate:.0%}", f"{usage['evictions']} evictions", delta_color="off")
+        if usage['tracked']:
+            held = ', '.join(f"{name.replace('_', ' ')} {size / 1024 ** 2:.1f} MB"
+                             for name, size in usage['tracked'].items())
+            st.caption(f"Memory used includes shared stores: {held}")
 
 # Footer
 st.markdown("---")
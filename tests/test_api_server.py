@@ -0,0 +1,135 @@
+import asyncio
+import gzip
+import json
+
+import pytest
+
+from api_server import ROUTES, ApiServer
+
+
+@pytest.fixture(scope='module')
+def server(tmp_path_factory):
+    import cache_governor
+    import snapshots
+    from cache_governor import CacheGovernor
+    from config import IMPORT_CONFIG, WARM_START_CONFIG
+
+    tmp_path = tmp_path_factory.mktemp('api')
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        # Sample data only, and no warm-start snapshot from a previous launch
+        monkeypatch.setitem(IMPORT_CONFIG, 'database', str(tmp_path / 'imports.db'))
+        monkeypatch.setitem(WARM_START_CONFIG, 'snapshot_path', str(tmp_path / 'warm_start.pkl'))
+        monkeypatch.setattr(snapshots, '_loaded', None)
+        monkeypatch.setattr(cache_governor, 'governor', CacheGovernor(budget_bytes=10 ** 8))
+        # Without a process pool the routes run on the loop's default thread pool
+        yield ApiServer(port=8502, workers=1)
+
+
+def _get(server, target, method='GET', **headers):
+    raw = asyncio.run(server._respond(method, target, {k.replace('_', '-'): v for k, v in headers.items()},
+                                      keep_alive=True))
+    head, body = raw.split(b'\r\n\r\n', 1)
+    status_line, *lines = head.decode('latin-1').split('\r\n')
+    fields = dict(line.split(': ', 1) for line in lines)
+    return int(status_line.split(' ')[1]), fields, body
+
+
+def _json(server, target, **headers):
+    status, fields, body = _get(server, target, **headers)
+    if fields.get('Content-Encoding') == 'gzip':
+        body = gzip.decompress(body)
+    return status, fields, json.loads(body)
+
+
+def test_every_route_answers_with_cacheable_json(server):
+    for path in ROUTES:
+        status, fields, payload = _json(server, path)
+        assert status == 200, (path, payload)
+        assert payload, path
+        assert fields['Cache-Control'] == 'public, max-age=60'
+        assert fields['ETag'].startswith('"')
+
+
+def test_route_payloads(server):
+    _, _, sites = _json(server, '/api/datasets/heritage-sites')
+    assert {'site_name', 'state'} <= set(sites[0])
+    _, _, season = _json(server, '/api/seasonality')
+    assert season['region'] == 'India' and set(season['index']) == {str(m) for m in range(1, 13)}
+    _, _, picks = _json(server, '/api/recommendations?prefer_unesco=true')
+    assert all('score' in pick for pick in picks)
+    _, _, untapped = _json(server, '/api/untapped-destinations?threshold_percentile=50')
+    assert isinstance(untapped, list)
+
+
+def test_economic_impact_keeps_counts_integral(server):
+    status, _, impact = _json(server, '/api/economic-impact?visitors=1000')
+    assert status == 200
+    assert impact['source'] == 'visitors'
+    assert impact['jobs_supported'] == 7 and isinstance(impact['jobs_supported'], int)
+    assert impact['direct_revenue'] == 7500000.0
+
+    _, _, projected = _json(server, '/api/economic-impact')
+    assert projected['source'] == 'forecast' and projected['visitors'] > 0
+
+
+def test_if_none_match_answers_not_modified(server):
+    _, fields, _ = _get(server, '/api/seasonality')
+    status, headers, body = _get(server, '/api/seasonality', if_none_match=fields['ETag'])
+    assert (status, body) == (304, b'')
+    assert headers['ETag'] == fields['ETag']
+    status, _, _ = _get(server, '/api/seasonality', if_none_match=f"W/{fields['ETag']}, \"other\"")
+    assert status == 304
+    status, _, _ = _get(server, '/api/seasonality', if_none_match='"other"')
+    assert status == 200
+
+
+def test_gzip_bodies_have_their_own_etag(server):
+    path = '/api/datasets/heritage-sites'
+    _, plain, body = _get(server, path)
+    status, zipped, compressed = _get(server, path, accept_encoding='gzip, deflate')
+    assert status == 200 and zipped['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(compressed) == body
+    assert zipped['ETag'] != plain['ETag']
+    assert zipped['Vary'] == 'Accept-Encoding'
+
+    # A tag for one encoding does not validate the other
+    status, _, _ = _get(server, path, if_none_match=plain['ETag'], accept_encoding='gzip')
+    assert status == 200
+    status, headers, _ = _get(server, path, if_none_match=zipped['ETag'], accept_encoding='gzip')
+    assert status == 304 and 'Content-Encoding' not in headers
+
+
+def test_head_sends_headers_only(server):
+    status, fields, body = _get(server, '/api/seasonality', method='HEAD')
+    assert status == 200 and body == b'' and int(fields['Content-Length']) > 0
+
+
+@pytest.mark.parametrize('target, status', [
+    ('/api/untapped-destinations?threshold_percentile=abc', 400),
+    ('/api/untapped-destinations?threshold_percentile=0', 400),
+    ('/api/economic-impact?visitors=many', 400),
+    ('/api/seasonality?state=Atlantis', 404),
+    ('/api/economic-impact?state=Atlantis', 404),
+    ('/api/unknown', 404),
+])
+def test_client_errors_are_not_cached(server, target, status):
+    code, fields, payload = _json(server, target)
+    assert code == status
+    assert 'error' in payload
+    assert fields['Cache-Control'] == 'no-store'
+    assert 'ETag' not in fields
+
+
+def test_only_get_is_allowed(server):
+    status, fields, _ = _get(server, '/api/seasonality', method='POST')
+    assert status == 405 and fields['Cache-Control'] == 'no-store'
+
+
+def test_unexpected_errors_are_server_errors(server, monkeypatch):
+    def broken(params):
+        raise KeyError('missing column')
+
+    monkeypatch.setitem(ROUTES, '/api/broken', broken)
+    status, fields, payload = _json(server, '/api/broken')
+    assert status == 500 and 'KeyError' in payload['error']
+    assert fields['Cache-Control'] == 'no-store'
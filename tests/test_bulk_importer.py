@@ -0,0 +1,148 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from bulk_importer import normalize_state, run_import
+
+
+def _write_csv(path, text):
+    path.write_text(text.strip() + '\n')
+    return str(path)
+
+
+def _import(database, *inputs, chunk_size=2):
+    return run_import(list(inputs), database=str(database), chunk_size=chunk_size,
+                      workers=2, on_progress=lambda counts: None)
+
+
+def _rows(database, sql):
+    with sqlite3.connect(str(database)) as conn:
+        return conn.execute(sql).fetchall()
+
+
+def test_error_rows_keep_their_file_line_numbers_across_chunks(tmp_path):
+    sites = _write_csv(tmp_path / 'sites.csv', """
+Name of Monument,State/UT,UNESCO,Total Visitors
+Taj Mahal,UP,Yes,"1,200,000"
+Red Fort,NCT of Delhi,yes,abc
+,Kerala,no,5
+Hampi,Karnataka,maybe,7
+Konark Sun Temple,Orissa,Y,100
+""")
+    database = tmp_path / 'imports.db'
+    [counts] = _import(database, ('sites', sites))
+
+    assert (counts['rows'], counts['imported'], counts['errors']) == (5, 2, 3)
+    errors = _rows(database, 'SELECT line, reason FROM import_errors ORDER BY line')
+    assert errors == [(3, 'invalid annual_visitors_2023'),
+                      (4, 'missing site_name'),
+                      (5, 'invalid unesco_status')]
+    assert _rows(database, 'SELECT site_name, state, annual_visitors_2023 FROM heritage_sites '
+                           'ORDER BY site_name') == [('Konark Sun Temple', 'Odisha', 100),
+                                                     ('Taj Mahal', 'Uttar Pradesh', 1200000)]
+
+
+def test_later_rows_and_later_files_win_for_duplicate_keys(tmp_path):
+    first = _write_csv(tmp_path / 'first.csv', """
+site,state,visitors
+Hampi,Karnataka,1
+Gol Gumbaz,Karnataka,2
+Hampi,karnataka,3
+Sun Temple,Odisha,4
+""")
+    second = _write_csv(tmp_path / 'second.csv', """
+site,state,visitors
+Sun Temple,Odisha,5
+Sun Temple,Gujarat,6
+""")
+    database = tmp_path / 'imports.db'
+    _import(database, ('sites', first), ('sites', second))
+
+    assert _rows(database, 'SELECT site_name, state, annual_visitors_2023 FROM heritage_sites '
+                           'ORDER BY site_name, state') == [('Gol Gumbaz', 'Karnataka', 2),
+                                                            ('Hampi', 'Karnataka', 3),
+                                                            ('Sun Temple', 'Gujarat', 6),
+                                                            ('Sun Temple', 'Odisha', 5)]
+
+
+def test_reimporting_a_file_replaces_its_error_rows(tmp_path):
+    path = tmp_path / 'arts.csv'
+    arts = _write_csv(path, """
+name,category,state,practitioners
+Warli,Painting,Maharashtra,lots
+Kathak,Dance,Uttar Pradesh,30000
+""")
+    database = tmp_path / 'imports.db'
+    _import(database, ('arts', arts))
+    _import(database, ('arts', arts))
+    assert _rows(database, 'SELECT COUNT(*) FROM import_errors') == [(1,)]
+
+    _write_csv(path, """
+name,category,state,practitioners
+Warli,Painting,Maharashtra,5000
+""")
+    _import(database, ('arts', arts))
+    assert _rows(database, 'SELECT COUNT(*) FROM import_errors') == [(0,)]
+    assert _rows(database, 'SELECT art_form, origin_state, practitioners_estimated '
+                           'FROM traditional_arts ORDER BY art_form') == [
+        ('Kathak', 'Uttar Pradesh', 30000), ('Warli', 'Maharashtra', 5000)]
+
+
+def test_monthly_rows_collapse_onto_their_month(tmp_path):
+    pytest.importorskip('openpyxl')
+    path = tmp_path / 'its.xlsx'
+    pd.DataFrame({'Month/Year': ['Jan 2024', '2024-02', 'bad', '2024-01-15'],
+                  'FTA': [1, 2, 3, 4], 'DTV': [10, 20, 30, 40]}).to_excel(path, index=False)
+    database = tmp_path / 'imports.db'
+    _import(database, ('monthly', str(path)))
+
+    assert _rows(database, 'SELECT month, domestic_tourists, international_tourists '
+                           'FROM tourism_stats ORDER BY month') == [('2024-01-01', 40, 4),
+                                                                    ('2024-02-01', 20, 2)]
+    assert _rows(database, 'SELECT line, reason FROM import_errors') == [(4, 'invalid month')]
+
+
+def test_unknown_schemas_and_missing_files_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match='Unknown schema'):
+        _import(tmp_path / 'imports.db', ('castles', 'x.csv'))
+    with pytest.raises(FileNotFoundError):
+        _import(tmp_path / 'imports.db', ('sites', str(tmp_path / 'missing.csv')))
+
+
+@pytest.mark.parametrize('raw, expected', [
+    ('  tamil   nadu ', 'Tamil Nadu'),
+    ('TN', 'Tamil Nadu'),
+    ('Orissa', 'Odisha'),
+    ('Karnatka', 'Karnataka'),
+    ('Jammu and Kashmir', 'Jammu and Kashmir'),
+])
+def test_normalize_state(raw, expected):
+    assert normalize_state(raw) == expected
+
+
+def test_loaders_accept_imports_without_optional_columns(tmp_path, monkeypatch):
+    import cache_governor
+    import data_loader
+    from cache_governor import CacheGovernor
+    from config import IMPORT_CONFIG
+
+    database = tmp_path / 'imports.db'
+    monkeypatch.setitem(IMPORT_CONFIG, 'database', str(database))
+    monkeypatch.setattr(cache_governor, 'governor', CacheGovernor(budget_bytes=10 ** 7))
+    arts = _write_csv(tmp_path / 'arts.csv', """
+name,category,state
+Warli,Painting,Maharashtra
+Kathak,Dance,Uttar Pradesh
+""")
+    sites = _write_csv(tmp_path / 'sites.csv', """
+site,state
+Hampi,Karnataka
+""")
+    _import(database, ('arts', arts), ('sites', sites))
+
+    loaded = data_loader.load_traditional_arts()
+    assert loaded['art_form'].tolist() == ['Warli', 'Kathak']
+    assert loaded['practitioners_estimated'].tolist() == [0, 0]
+    assert loaded['preservation_status'].tolist() == ['At Risk', 'At Risk']
+    assert data_loader.load_cultural_heritage_sites()['annual_visitors_2023'].tolist() == [0]
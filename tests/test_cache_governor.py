@@ -0,0 +1,167 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import cache_governor
+from cache_governor import MISSING, CacheGovernor, deep_sizeof, governed_cache
+
+ARRAY_BYTES = 8000
+
+
+def _array(fill):
+    return np.full(ARRAY_BYTES // 8, fill, dtype='float64')
+
+
+def test_deep_sizeof_counts_frame_buffers():
+    frame = pd.DataFrame({'a': np.zeros(10000)})
+    assert deep_sizeof(frame) >= 80000
+    assert deep_sizeof({'x': frame, 'y': frame}) < 2 * deep_sizeof(frame)
+
+
+def test_cheap_entries_are_evicted_before_expensive_ones():
+    governor = CacheGovernor(budget_bytes=int(ARRAY_BYTES * 2.5))
+    governor.put('expensive', _array(1), cost=5.0)
+    governor.put('cheap', _array(2), cost=0.001)
+    governor.put('new', _array(3), cost=1.0)
+    assert governor.get('cheap') is MISSING
+    assert governor.get('expensive') is not MISSING
+    assert governor.usage()['evictions'] == 1
+
+
+def _aged_governor():
+    """x (cost 2) idles while evicting z advances the clock past it; y (cost 1) arrives after"""
+    governor = CacheGovernor(budget_bytes=int(ARRAY_BYTES * 2.5))
+    governor.put('x', _array(1), cost=2.0)
+    governor.put('z', _array(2), cost=1.5)
+    governor.put('y', _array(3), cost=1.0)
+    assert governor.get('z') is MISSING
+    return governor
+
+
+def test_clock_ages_out_idle_expensive_entries():
+    governor = _aged_governor()
+    governor.put('w', _array(4), cost=1.0)
+    assert governor.get('x') is MISSING
+    assert governor.get('y') is not MISSING
+
+
+def test_hits_refresh_priority_against_the_clock():
+    governor = _aged_governor()
+    governor.get('x')
+    governor.put('w', _array(4), cost=1.0)
+    assert governor.get('y') is MISSING
+    assert governor.get('x') is not MISSING
+
+
+def test_entries_over_the_budget_are_not_cached():
+    governor = CacheGovernor(budget_bytes=ARRAY_BYTES // 2)
+    governor.put('big', _array(1))
+    assert governor.get('big') is MISSING
+    assert governor.usage()['used_bytes'] == 0
+
+
+def test_ttl_expires_entries():
+    governor = CacheGovernor(budget_bytes=10 ** 6)
+    governor.put('old', 1, created=1.0)
+    assert governor.get('old', ttl=60) is MISSING
+    assert governor.get('old') is MISSING
+
+
+def test_evicted_entries_round_trip_through_the_process_spill_dir(tmp_path):
+    governor = CacheGovernor(budget_bytes=int(ARRAY_BYTES * 1.5), spill_root=str(tmp_path),
+                             spill_budget_bytes=10 ** 6)
+    assert governor.spill_dir == os.path.join(str(tmp_path), str(os.getpid()))
+    governor.put('first', _array(1), cost=1.0)
+    governor.put('second', _array(2), cost=1.0)
+    assert governor.usage()['spilled_entries'] == 1
+    assert len(os.listdir(governor.spill_dir)) == 1
+
+    np.testing.assert_array_equal(governor.get('first'), _array(1))
+    usage = governor.usage()
+    assert usage['spill_hits'] == 1
+    # Reloading first pushed second out to disk in its place
+    assert usage['spilled_entries'] == 1
+    np.testing.assert_array_equal(governor.get('second'), _array(2))
+
+
+def test_spill_budget_drops_the_oldest_files(tmp_path):
+    governor = CacheGovernor(budget_bytes=int(ARRAY_BYTES * 1.5), spill_root=str(tmp_path),
+                             spill_budget_bytes=int(ARRAY_BYTES * 2.5))
+    for i in range(5):
+        governor.put(i, _array(i), cost=1.0)
+    assert governor.usage()['spilled_entries'] == 2
+    assert len(os.listdir(governor.spill_dir)) == 2
+    assert governor.get(0) is MISSING
+    assert governor.get(3) is not MISSING
+
+
+def test_clear_removes_spilled_files(tmp_path):
+    governor = CacheGovernor(budget_bytes=int(ARRAY_BYTES * 1.5), spill_root=str(tmp_path),
+                             spill_budget_bytes=10 ** 6)
+    governor.put('first', _array(1))
+    governor.put('second', _array(2))
+    governor.clear()
+    assert os.listdir(governor.spill_dir) == []
+    assert governor.usage()['spilled_entries'] == 0
+
+
+def test_spill_dirs_of_dead_processes_and_old_files_are_removed(tmp_path):
+    orphan = tmp_path / '999999999'
+    orphan.mkdir()
+    (orphan / 'entry.pkl').write_bytes(b'x')
+    (tmp_path / 'shared-layout.pkl').write_bytes(b'x')
+    own = tmp_path / str(os.getpid())
+    own.mkdir()
+    (own / 'stale.pkl').write_bytes(b'x')
+
+    CacheGovernor(budget_bytes=10 ** 6, spill_root=str(tmp_path))
+    assert sorted(os.listdir(tmp_path)) == []
+
+
+def test_governed_cache_returns_copies_and_follows_depends_on(monkeypatch):
+    monkeypatch.setattr(cache_governor, 'governor', CacheGovernor(budget_bytes=10 ** 7))
+    source = {'version': 1}
+    calls = []
+
+    @governed_cache(depends_on=lambda: source['version'])
+    def load():
+        calls.append(1)
+        return pd.DataFrame({'a': [source['version']]})
+
+    first = load()
+    first.loc[0, 'a'] = 99
+    assert load().loc[0, 'a'] == 1
+    assert len(calls) == 1
+
+    source['version'] = 2
+    assert load().loc[0, 'a'] == 2
+    assert len(calls) == 2
+
+
+class _Resource:
+    def __init__(self, fill):
+        self.values = _array(fill)
+
+
+def test_tracked_objects_count_against_the_budget_until_collected():
+    governor = CacheGovernor(budget_bytes=int(ARRAY_BYTES * 2.5))
+    governor.put('a', _array(1), cost=1.0)
+    governor.put('b', _array(2), cost=2.0)
+
+    store = _Resource(3)
+    governor.track('store', store)
+    usage = governor.usage()
+    assert usage['tracked']['store'] >= ARRAY_BYTES
+    assert governor.get('a') is MISSING
+    assert usage['used_bytes'] <= governor.budget_bytes
+
+    replacement = _Resource(4)
+    governor.track('store', replacement)
+    del store
+    # Collecting the replaced object must not release the replacement's share
+    assert 'store' in governor.usage()['tracked']
+
+    del replacement
+    assert governor.usage()['tracked'] == {}
+    assert governor.usage()['used_bytes'] == deep_sizeof(_array(2))
@@ -0,0 +1,168 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from data_backend import SQLiteBackend, _ReadWriteLock, create_backend
+
+
+@pytest.fixture
+def backend():
+    backend = SQLiteBackend(pool_size=4)
+    backend.load_table('sites', pd.DataFrame({
+        'site': ['Hampi', 'Konark', 'Khajuraho', 'Ajanta', 'Ellora', 'Sanchi', 'Qutub Minar'],
+        'state': ['Karnataka', 'Odisha', 'Madhya Pradesh', 'Maharashtra', 'Maharashtra',
+                  'Madhya Pradesh', 'Delhi'],
+        'visitors': [500, 300, 500, 300, 500, 100, 300],
+    }))
+    return backend
+
+
+def test_pages_of_a_sort_with_ties_cover_every_row_once(backend):
+    full = backend.select('sites', order_by='visitors', descending=True)
+    pages = [backend.select('sites', order_by='visitors', descending=True, limit=2, offset=offset)
+             for offset in range(0, 7, 2)]
+    assert pd.concat(pages)['site'].tolist() == full['site'].tolist()
+    # Ties keep load order
+    assert full['site'].tolist() == ['Hampi', 'Khajuraho', 'Ellora', 'Konark', 'Ajanta',
+                                     'Qutub Minar', 'Sanchi']
+
+
+def test_filters_accept_values_lists_and_none(backend):
+    assert backend.count('sites', {'state': 'Maharashtra'}) == 2
+    assert backend.count('sites', {'state': ['Delhi', 'Odisha'], 'visitors': 300}) == 2
+    assert backend.count('sites', {'state': None}) == 7
+    assert backend.count('sites', {'state': []}) == 0
+
+
+def test_position_matches_the_sorted_rows(backend):
+    options = dict(order_by='visitors', descending=True)
+    full = backend.select('sites', **options)['site'].tolist()
+    for site in full:
+        assert backend.position('sites', 'site', site, **options) == full.index(site)
+    assert backend.position('sites', 'site', 'Sanchi', filters={'state': 'Madhya Pradesh'}, **options) == 1
+    assert backend.position('sites', 'site', 'Taj Mahal') is None
+
+
+def test_count_by_matches_value_counts(backend):
+    frame = backend.select('sites')
+    for column in ('state', 'visitors'):
+        counts = backend.count_by('sites', column)
+        expected = frame[column].value_counts()
+        assert counts.index.tolist() == expected.index.tolist()
+        assert counts.tolist() == expected.tolist()
+    assert backend.distinct('sites', 'state', filters={'visitors': 500}) == [
+        'Karnataka', 'Madhya Pradesh', 'Maharashtra']
+
+
+def test_bool_and_datetime_columns_keep_their_dtypes():
+    backend = create_backend('sqlite')
+    frame = pd.DataFrame({'name': ['a', 'b'], 'unesco': [True, False],
+                          'listed': pd.to_datetime(['1986-01-01', '2014-06-22'])})
+    backend.load_table('t', frame)
+    selected = backend.select('t')
+    assert selected.dtypes.to_dict() == frame.dtypes.to_dict()
+    pd.testing.assert_frame_equal(selected, frame)
+    assert backend.select('t', filters={'unesco': True})['name'].tolist() == ['a']
+
+
+def test_unknown_tables_and_columns_are_rejected(backend):
+    with pytest.raises(KeyError):
+        backend.select('missing')
+    with pytest.raises(KeyError):
+        backend.select('sites', columns=['nope'])
+    with pytest.raises(KeyError):
+        backend.count('sites', {'nope': 1})
+    with pytest.raises(ValueError):
+        create_backend('warehouse')
+
+
+def test_table_versions_follow_only_their_own_contents(backend):
+    backend.load_table('arts', pd.DataFrame({'art': ['Warli']}))
+    sites, arts = backend.table_version('sites'), backend.table_version('arts')
+    token, loads = backend.version
+
+    backend.load_table('arts', pd.DataFrame({'art': ['Warli', 'Kathak']}))
+    assert backend.table_version('sites') == sites
+    assert backend.table_version('arts') != arts
+    assert backend.version[0] != token and backend.version[1] == loads + 1
+
+    # Equal contents give equal versions, also across backends
+    backend.load_table('arts', pd.DataFrame({'art': ['Warli']}))
+    assert backend.table_version('arts') == arts
+    other = SQLiteBackend()
+    other.load_table('arts', pd.DataFrame({'art': ['Warli']}))
+    assert other.table_version('arts') == arts
+    with pytest.raises(KeyError):
+        backend.table_version('missing')
+
+
+def test_table_handles_query_their_table(backend):
+    sites = backend.table('sites')
+    assert sites.version == backend.table_version('sites')
+    assert sites.select(columns=['site'], limit=1)['site'].tolist() == ['Hampi']
+    assert sites.count_by('state').iloc[0] == 2
+    assert sites.distinct('visitors') == [500, 300, 100]
+
+
+def test_writer_waits_for_readers_and_holds_off_new_ones():
+    lock = _ReadWriteLock()
+    events = []
+    reading = threading.Event()
+    writer_waiting = threading.Event()
+
+    def reader(name, hold):
+        with lock.reading():
+            events.append(f'{name} in')
+            reading.set()
+            time.sleep(hold)
+            events.append(f'{name} out')
+
+    def writer():
+        writer_waiting.set()
+        with lock.writing():
+            events.append('writer')
+
+    first = threading.Thread(target=reader, args=('first', 0.2))
+    first.start()
+    reading.wait()
+    write = threading.Thread(target=writer)
+    write.start()
+    writer_waiting.wait()
+    time.sleep(0.05)
+    second = threading.Thread(target=reader, args=('second', 0))
+    second.start()
+    for thread in (first, write, second):
+        thread.join(timeout=5)
+
+    assert events == ['first in', 'first out', 'writer', 'second in', 'second out']
+
+
+def test_reloads_are_atomic_for_concurrent_readers(backend):
+    small = pd.DataFrame({'site': ['a'] * 10, 'visitors': range(10)})
+    large = pd.DataFrame({'site': ['b'] * 500, 'visitors': range(500)})
+    stop = threading.Event()
+    seen, errors = set(), []
+
+    def read():
+        while not stop.is_set():
+            try:
+                rows = backend.select('sites', columns=['site'])
+                seen.add((len(rows), frozenset(rows['site'])))
+            except Exception as e:
+                errors.append(e)
+
+    backend.load_table('sites', small)
+    readers = [threading.Thread(target=read) for _ in range(3)]
+    for thread in readers:
+        thread.start()
+    for frame in [large, small] * 10:
+        backend.load_table('sites', frame)
+    stop.set()
+    for thread in readers:
+        thread.join(timeout=5)
+
+    assert errors == []
+    assert seen <= {(10, frozenset('a')), (500, frozenset('b'))}
+    assert backend.count('sites') == 10
@@ -0,0 +1,134 @@
+import pandas as pd
+import pytest
+
+from cache_governor import CacheGovernor
+from data_backend import SQLiteBackend
+from dataflow import Dataflow, _code_hash, fingerprint
+
+
+@pytest.fixture
+def cache():
+    return CacheGovernor(budget_bytes=10 ** 7)
+
+
+def _chain(cache, name='chain'):
+    """prices -> doubled -> total, plus taxed reading prices and rate"""
+    flow = Dataflow(name, cache)
+
+    @flow.node(inputs=['prices'])
+    def doubled(prices):
+        return prices * 2
+
+    @flow.node(inputs=['doubled'])
+    def total(doubled):
+        return doubled.sum()
+
+    @flow.node(inputs=['prices', 'rate'])
+    def taxed(prices, rate):
+        return prices * (1 + rate)
+
+    return flow
+
+
+def test_results_are_reused_across_runs_with_equal_inputs(cache):
+    flow = _chain(cache)
+    first = flow.evaluate(prices=pd.Series([1, 2, 3]), rate=0.1)
+    assert first['total'] == 12
+    assert first.recomputed == ['doubled', 'total']
+
+    # An equal but distinct frame has the same fingerprint
+    second = flow.evaluate(prices=pd.Series([1, 2, 3]), rate=0.1)
+    assert second['total'] == 12
+    assert second.recomputed == []
+    assert second.reused == ['total']
+
+
+def test_changing_one_input_recomputes_only_its_downstream_nodes(cache):
+    flow = _chain(cache)
+    prices = pd.Series([1, 2, 3])
+    run = flow.evaluate(prices=prices, rate=0.1)
+    run['total'], run['taxed']
+
+    run = flow.evaluate(prices=prices, rate=0.2)
+    run['total'], run['taxed']
+    assert run.recomputed == ['taxed']
+    assert run.reused == ['total']
+
+    run = flow.evaluate(prices=pd.Series([1, 2, 4]), rate=0.2)
+    run['total'], run['taxed']
+    assert sorted(run.recomputed) == ['doubled', 'taxed', 'total']
+
+
+def test_editing_a_node_invalidates_its_results(cache):
+    flow = Dataflow('edited', cache)
+    flow.node(inputs=['values'], name='summary')(lambda values: values.sum())
+    assert flow.evaluate(values=pd.Series([1, 5]))['summary'] == 6
+
+    # Same graph name and inputs, different method called
+    edited = Dataflow('edited', cache)
+    edited.node(inputs=['values'], name='summary')(lambda values: values.max())
+    run = edited.evaluate(values=pd.Series([1, 5]))
+    assert run['summary'] == 5
+    assert run.recomputed == ['summary']
+
+
+def test_code_hash_is_stable_across_compilations():
+    source = "def node(frame):\n    return {c: [v for v in frame[c]] for c in frame}\n"
+    hashes = set()
+    for _ in range(2):
+        namespace = {}
+        exec(compile(source, '<node>', 'exec'), namespace)
+        hashes.add(_code_hash(namespace['node'].__code__))
+    assert len(hashes) == 1
+
+
+def test_computable_follows_available_inputs(cache):
+    flow = _chain(cache)
+    run = flow.evaluate(prices=pd.Series([1]))
+    assert run.computable('total')
+    assert not run.computable('taxed')
+    assert not run.computable('unknown')
+    with pytest.raises(KeyError):
+        run['unknown']
+
+
+def test_duplicate_node_names_are_rejected(cache):
+    flow = _chain(cache)
+    with pytest.raises(ValueError):
+        flow.node(inputs=['prices'], name='total')(lambda prices: prices)
+
+
+def test_reloading_one_table_leaves_nodes_of_other_tables_memoized(cache):
+    backend = SQLiteBackend()
+    backend.load_table('arts', pd.DataFrame({'category': ['Dance', 'Music', 'Dance']}))
+    backend.load_table('schemes', pd.DataFrame({'budget': [10, 20]}))
+    flow = Dataflow('tables', cache)
+
+    @flow.node(inputs=['arts'])
+    def categories(arts):
+        return arts.count_by('category')
+
+    @flow.node(inputs=['schemes'])
+    def budget(schemes):
+        return schemes.select()['budget'].sum()
+
+    def evaluate():
+        run = flow.evaluate(arts=backend.table('arts'), schemes=backend.table('schemes'))
+        return run, run['categories'], run['budget']
+
+    evaluate()
+    backend.load_table('schemes', pd.DataFrame({'budget': [10, 20, 30]}))
+    run, counts, total = evaluate()
+    assert run.recomputed == ['budget']
+    assert total == 60
+    assert counts.to_dict() == {'Dance': 2, 'Music': 1}
+
+
+def test_fingerprint_distinguishes_stores_with_equal_append_counts():
+    from timeseries_store import TimeSeriesStore
+
+    stores = [TimeSeriesStore(), TimeSeriesStore()]
+    for store, value in zip(stores, (1, 2)):
+        store.append('Hampi', 'Karnataka', '2023-01-01',
+                     {'domestic_tourists': [value], 'international_tourists': [0]})
+    assert fingerprint(stores[0]) != fingerprint(stores[1])
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from forecasting import SeasonalForecaster, seasonal_naive
+from timeseries_store import TimeSeriesStore
+
+SEASON = np.array([120, 130, 140, 110, 80, 60, 50, 60, 90, 150, 170, 180], dtype='float64')
+
+
+def _series(count, months, seed=0):
+    rng = np.random.default_rng(seed)
+    trend = np.arange(months) * rng.uniform(0.5, 2, (count, 1))
+    return SEASON[np.arange(months) % 12] * rng.uniform(1, 5, (count, 1)) + trend + rng.normal(0, 3, (count, months))
+
+
+def _months(count):
+    return pd.date_range('2018-01-01', periods=count, freq='MS')
+
+
+def _store(scale, days=4 * 365):
+    store = TimeSeriesStore()
+    index = pd.date_range('2020-01-01', periods=days, freq='D')
+    values = (SEASON[index.month - 1] * scale).astype(int)
+    store.append('Hampi', 'Karnataka', index[0], {'domestic_tourists': values,
+                                                 'international_tourists': values // 10})
+    return store
+
+
+def test_incremental_update_matches_a_full_fit():
+    values = _series(5, 48)
+    keys = [('site', f"site {i}") for i in range(5)]
+    options = dict(smoothing_grid=[0.3], refit_every=1000)
+
+    incremental = SeasonalForecaster(**options).fit(keys, _months(30), values[:, :30])
+    incremental.update(keys, _months(41), values[:, :41]).update(keys, _months(48), values)
+    full = SeasonalForecaster(**options).fit(keys, _months(48), values)
+
+    np.testing.assert_allclose(incremental.forecast(), full.forecast())
+    assert incremental.future_months().equals(full.future_months())
+
+
+def test_update_refits_after_refit_every_months():
+    values = _series(3, 40)
+    keys = [('state', s) for s in 'abc']
+    forecaster = SeasonalForecaster(refit_every=6).fit(keys, _months(30), values[:, :30])
+    forecaster.update(keys, _months(34), values[:, :34])
+    assert forecaster._fit.since_refit == 4
+    forecaster.update(keys, _months(40), values)
+    assert forecaster._fit.since_refit == 0
+
+
+def test_changed_series_set_triggers_a_refit():
+    values = _series(3, 36)
+    forecaster = SeasonalForecaster().fit(['a', 'b', 'c'], _months(36), values)
+    forecaster.update(['a', 'b'], _months(36), values[:2])
+    assert forecaster.keys == ['a', 'b']
+    assert forecaster.forecast().shape == (2, forecaster.horizon)
+
+
+def test_refresh_refits_for_a_rebuilt_store_with_the_same_append_count():
+    forecaster = SeasonalForecaster()
+    before = forecaster.refresh(_store(1)).projection(('national', 'India')).sum()
+    after = forecaster.refresh(_store(3)).projection(('national', 'India')).sum()
+    assert after == pytest.approx(3 * before, rel=0.01)
+
+
+def test_refresh_is_a_no_op_for_an_unchanged_store():
+    store = _store(1)
+    forecaster = SeasonalForecaster().refresh(store)
+    fit = forecaster._fit
+    assert forecaster.refresh(store)._fit is fit
+
+
+def test_seasonal_naive_drift_ignores_the_seasonal_swing():
+    # 18 months of a flat year: last - first would read the swing as trend
+    history = SEASON[np.arange(18) % 12][None]
+    np.testing.assert_allclose(seasonal_naive(history, 24, 12)[0],
+                               np.tile(SEASON[np.arange(6, 18) % 12], 2))
+
+
+def test_seasonal_naive_drift_follows_year_over_year_growth():
+    history = (SEASON[np.arange(18) % 12] + np.repeat([0, 12], [12, 6]))[None]
+    projected = seasonal_naive(history, 24, 12)[0]
+    # One unit of growth per month: the second projected year sits 12 above the first
+    np.testing.assert_allclose(projected[12:] - projected[:12], 12)
+
+
+def test_short_histories_fall_back_to_seasonal_naive():
+    values = _series(2, 18)
+    forecaster = SeasonalForecaster().fit(['a', 'b'], _months(18), values)
+    np.testing.assert_allclose(forecaster.forecast(),
+                               np.clip(seasonal_naive(values, forecaster.horizon, 12), 0, None))
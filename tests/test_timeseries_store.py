@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from timeseries_store import ROLLUP_RESOLUTIONS, TimeSeriesStore, pick_resolution
+
+RESAMPLE_RULES = {'week': 'W-MON', 'month': 'MS', 'quarter': 'QS', 'year': 'YS'}
+
+SITES = [('Hampi', 'Karnataka', '2021-03-17'), ('Mysore Palace', 'Karnataka', '2021-01-01'),
+         ('Konark Sun Temple', 'Odisha', '2021-06-30')]
+
+
+def _daily(seed, start, days):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(start, periods=days, freq='D')
+    return pd.DataFrame({'domestic_tourists': rng.integers(0, 5000, days),
+                         'international_tourists': rng.integers(0, 500, days)}, index=index)
+
+
+def _resampled(frame, resolution):
+    return frame.resample(RESAMPLE_RULES[resolution], label='left', closed='left').sum()
+
+
+@pytest.fixture
+def loaded():
+    """A store filled in uneven slices that start and end mid-week and mid-month, plus the raw days"""
+    store = TimeSeriesStore()
+    raw = {}
+    for seed, (site, state, start) in enumerate(SITES):
+        frame = _daily(seed, start, 500)
+        raw[site] = (state, frame)
+        cuts = [0, 11, 40, 41, 200, 333, 500]
+        for lo, hi in zip(cuts, cuts[1:]):
+            part = frame.iloc[lo:hi]
+            store.append(site, state, part.index[0], {c: part[c].values for c in part})
+    return store, raw
+
+
+@pytest.mark.parametrize('resolution', ROLLUP_RESOLUTIONS)
+def test_site_rollups_match_resampled_days(loaded, resolution):
+    store, raw = loaded
+    for site, (_, frame) in raw.items():
+        expected = _resampled(frame, resolution)
+        actual = store.rollup(resolution, site=site)
+        np.testing.assert_array_equal(actual.index.values, expected.index.values)
+        np.testing.assert_array_equal(actual.values, expected.values)
+
+
+@pytest.mark.parametrize('resolution', ROLLUP_RESOLUTIONS)
+def test_state_and_national_rollups_sum_their_sites(loaded, resolution):
+    store, raw = loaded
+    everything = pd.concat([frame for _, frame in raw.values()]).groupby(level=0).sum()
+    karnataka = pd.concat([f for s, f in raw.values() if s == 'Karnataka']).groupby(level=0).sum()
+
+    for actual, days in ((store.rollup(resolution), everything),
+                         (store.rollup(resolution, state='Karnataka'), karnataka)):
+        expected = _resampled(days, resolution)
+        expected = expected.loc[expected.index >= actual.index[0]]
+        np.testing.assert_array_equal(actual.values, expected.values)
+
+
+def test_append_mid_period_updates_only_that_period():
+    store = TimeSeriesStore()
+    ones = {'domestic_tourists': [1] * 10, 'international_tourists': [0] * 10}
+    store.append('Hampi', 'Karnataka', '2023-01-01', ones)
+    store.append('Hampi', 'Karnataka', '2023-01-11', ones)
+    store.append('Hampi', 'Karnataka', '2023-01-21', {'domestic_tourists': [2] * 15,
+                                                      'international_tourists': [1] * 15})
+
+    monthly = store.rollup('month')
+    assert monthly.loc['2023-01-01', 'domestic_tourists'] == 20 + 2 * 11
+    assert monthly.loc['2023-02-01', 'domestic_tourists'] == 2 * 4
+    assert monthly['international_tourists'].sum() == 15
+    assert store.rollup('year')['domestic_tourists'].tolist() == [50]
+
+
+def test_query_reads_daily_values_for_short_windows(loaded):
+    store, raw = loaded
+    resolution, frame = store.query('2021-07-01', '2021-07-20', site='Hampi')
+    assert resolution == 'day'
+    expected = raw['Hampi'][1].loc['2021-07-01':'2021-07-20']
+    np.testing.assert_array_equal(frame.values, expected.values)
+
+
+def test_pick_resolution_keeps_points_under_the_limit():
+    assert pick_resolution('2023-01-01', '2023-03-31', max_points=120) == 'day'
+    assert pick_resolution('2020-01-01', '2023-12-31', max_points=120) == 'month'
+    assert pick_resolution('2000-01-01', '2023-12-31', max_points=20) == 'year'
+
+
+def test_appends_must_continue_from_the_last_day():
+    store = TimeSeriesStore()
+    values = {'domestic_tourists': [1, 2], 'international_tourists': [0, 0]}
+    store.append('Hampi', 'Karnataka', '2023-01-01', values)
+    with pytest.raises(ValueError, match='must start on 2023-01-03'):
+        store.append('Hampi', 'Karnataka', '2023-01-05', values)
+    with pytest.raises(ValueError, match='stored under Karnataka'):
+        store.append('Hampi', 'Goa', '2023-01-03', values)
+    with pytest.raises(ValueError, match='Negative'):
+        store.append('Hampi', 'Karnataka', '2023-01-03',
+                     {'domestic_tourists': [-1, 2], 'international_tourists': [0, 0]})
+
+
+def test_version_changes_on_append_and_differs_between_stores():
+    values = {'domestic_tourists': [1], 'international_tourists': [0]}
+    first, second = TimeSeriesStore(), TimeSeriesStore()
+    before = first.version
+    first.append('Hampi', 'Karnataka', '2023-01-01', values)
+    second.append('Hampi', 'Karnataka', '2023-01-01', values)
+    assert first.version != before
+    assert first.version != second.version
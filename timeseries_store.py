@@ -0,0 +1,308 @@
+"""
+Time-series storage for daily tourist arrivals per cultural site
+Keeps one compact array-backed column per site and measure, accepts append-only
+ingestion and maintains week/month/quarter/year rollups per site, per state and
+for the whole country so charts never aggregate raw days on a rerun
+"""
+
+import uuid
+
+import numpy as np
+import pandas as pd
+
+MEASURES = ('domestic_tourists', 'international_tourists')
+
+# Resolutions materialized on every append; weeks start on Monday
+ROLLUP_RESOLUTIONS = ('week', 'month', 'quarter', 'year')
+
+# Approximate length of one point at each resolution, used to pick a chart resolution
+RESOLUTION_DAYS = {
+    'day': 1,
+    'week': 7,
+    'month': 30.44,
+    'quarter': 91.31,
+    'year': 365.25
+}
+
+NATIONAL = 'India'
+
+
+class _Column:
+    """Growable NumPy buffer holding one measure of one site, one value per day"""
+
+    __slots__ = ('buffer', 'length')
+
+    def __init__(self, dtype):
+        self.buffer = np.zeros(64, dtype=dtype)
+        self.length = 0
+
+    def extend(self, values):
+        needed = self.length + len(values)
+        if needed > len(self.buffer):
+            capacity = max(needed, len(self.buffer) * 2)
+            grown = np.zeros(capacity, dtype=self.buffer.dtype)
+            grown[:self.length] = self.buffer[:self.length]
+            self.buffer = grown
+        self.buffer[self.length:needed] = values
+        self.length = needed
+
+    def view(self, start=0, stop=None):
+        stop = self.length if stop is None else min(stop, self.length)
+        return self.buffer[max(start, 0):stop]
+
+
+class _SiteSeries:
+    """Daily arrivals of a single site starting at a fixed first day"""
+
+    __slots__ = ('site', 'state', 'start', 'columns')
+
+    def __init__(self, site, state, start, measures, dtype):
+        self.site = site
+        self.state = state
+        self.start = start
+        self.columns = {measure: _Column(dtype) for measure in measures}
+
+    @property
+    def length(self):
+        return next(iter(self.columns.values())).length
+
+    @property
+    def end(self):
+        """Day after the last stored day, i.e. where the next append must start"""
+        return self.start + pd.Timedelta(days=self.length)
+
+
+def _period_starts(days, resolution):
+    """First day of the period each day (datetime64[D]) falls in"""
+    if resolution == 'week':
+        # 1970-01-01 was a Thursday; shift so weeks start on Monday
+        numbers = days.astype('int64')
+        return (numbers - (numbers + 3) % 7).astype('datetime64[D]')
+    months = days.astype('datetime64[M]')
+    if resolution == 'quarter':
+        numbers = months.astype('int64')
+        months = (numbers - numbers % 3).astype('datetime64[M]')
+    elif resolution == 'year':
+        months = days.astype('datetime64[Y]')
+    return months.astype('datetime64[D]')
+
+
+class _Rollup:
+    """Period labels (datetime64[D], ascending) with one row of measure totals per period"""
+
+    __slots__ = ('labels', 'values')
+
+    def __init__(self, width):
+        self.labels = np.array([], dtype='datetime64[D]')
+        self.values = np.zeros((0, width), dtype='int64')
+
+    def accumulate(self, labels, delta):
+        """Add delta rows into the rollup, aligning on period labels"""
+        merged = np.union1d(self.labels, labels)
+        values = np.zeros((len(merged), self.values.shape[1]), dtype='int64')
+        values[np.searchsorted(merged, self.labels)] = self.values
+        values[np.searchsorted(merged, labels)] += delta
+        self.labels, self.values = merged, values
+
+    def to_frame(self, measures):
+        return pd.DataFrame(
+            self.values, columns=list(measures),
+            index=pd.DatetimeIndex(self.labels, name='period')
+        )
+
+
+class TimeSeriesStore:
+    """
+    Append-only store of daily arrivals per site with materialized rollups
+
+    Each append recomputes only the periods it touches: the site's rollups are
+    rebuilt from the first affected period onward and the difference is added
+    to the state and national rollups.
+    """
+
+    def __init__(self, measures=MEASURES, dtype=np.uint32):
+        self.measures = tuple(measures)
+        self.dtype = dtype
+        # Identifies this store so its versions are never confused with another store's
+        self.token = uuid.uuid4().hex
+        self._appends = 0
+        self._sites = {}
+        self._rollups = {'site': {}, 'state': {}, 'national': {}}
+
+    @property
+    def version(self):
+        """(token, append count); changes on every append and differs between stores"""
+        return self.token, self._appends
+
+    @property
+    def sites(self):
+        return list(self._sites)
+
+    @property
+    def states(self):
+        return sorted({series.state for series in self._sites.values()})
+
+    def date_range(self):
+        """First and last stored day across all sites"""
+        if not self._sites:
+            return None, None
+        first = min(series.start for series in self._sites.values())
+        last = max(series.end for series in self._sites.values()) - pd.Timedelta(days=1)
+        return first, last
+
+    def append(self, site, state, start, values):
+        """
+        Append consecutive daily values for a site
+
+        values maps every measure to an equal-length sequence of counts. A new
+        site may start on any day; an existing site must continue exactly from
+        the day after its last stored day.
+        """
+        start = pd.Timestamp(start).normalize()
+        missing = set(self.measures) - set(values)
+        if missing:
+            raise ValueError(f"Missing measures for {site}: {', '.join(sorted(missing))}")
+
+        arrays = {measure: np.asarray(values[measure]) for measure in self.measures}
+        lengths = {len(array) for array in arrays.values()}
+        if len(lengths) != 1:
+            raise ValueError(f"Measures for {site} have different lengths")
+        if lengths == {0}:
+            return
+        for measure, array in arrays.items():
+            if (array < 0).any():
+                raise ValueError(f"Negative {measure} values for {site}")
+
+        series = self._sites.get(site)
+        if series is None:
+            series = _SiteSeries(site, state, start, self.measures, self.dtype)
+            self._sites[site] = series
+        elif series.state != state:
+            raise ValueError(f"{site} is stored under {series.state}, not {state}")
+        elif start != series.end:
+            raise ValueError(
+                f"Appends for {site} must start on {series.end.date()}, got {start.date()}"
+            )
+
+        for measure, array in arrays.items():
+            series.columns[measure].extend(array)
+
+        for resolution in ROLLUP_RESOLUTIONS:
+            self._refresh_rollup(series, resolution, start)
+        self._appends += 1
+
+    def _refresh_rollup(self, series, resolution, first_new_day):
+        first_day = np.datetime64(first_new_day.date(), 'D')
+        period_start = _period_starts(np.array([first_day]), resolution)[0]
+        site_start = np.datetime64(series.start.date(), 'D')
+        offset = max(int((period_start - site_start).astype('int64')), 0)
+
+        days = site_start + np.arange(offset, series.length)
+        starts = _period_starts(days, resolution)
+        labels, boundaries = np.unique(starts, return_index=True)
+        fresh = np.column_stack([
+            np.add.reduceat(series.columns[measure].view(offset).astype('int64'), boundaries)
+            for measure in self.measures
+        ])
+
+        site_rollup = self._rollups['site'].setdefault(series.site, {}).setdefault(
+            resolution, _Rollup(len(self.measures))
+        )
+        cut = np.searchsorted(site_rollup.labels, labels[0])
+        delta = fresh.copy()
+        # A site's periods are contiguous, so the replaced rows line up with the start of fresh
+        replaced = site_rollup.values[cut:]
+        delta[:len(replaced)] -= replaced
+        site_rollup.labels = np.concatenate([site_rollup.labels[:cut], labels])
+        site_rollup.values = np.concatenate([site_rollup.values[:cut], fresh])
+
+        for scope, key in (('state', series.state), ('national', NATIONAL)):
+            scope_rollup = self._rollups[scope].setdefault(key, {}).setdefault(
+                resolution, _Rollup(len(self.measures))
+            )
+            scope_rollup.accumulate(labels, delta)
+
+    def rollup(self, resolution, site=None, state=None):
+        """Materialized rollup for a site, a state or (by default) the whole country"""
+        if resolution not in ROLLUP_RESOLUTIONS:
+            raise ValueError(f"Unknown rollup resolution: {resolution}")
+        if site is not None:
+            rollups = self._rollups['site'].get(site, {})
+        elif state is not None:
+            rollups = self._rollups['state'].get(state, {})
+        else:
+            rollups = self._rollups['national'].get(NATIONAL, {})
+        rollup = rollups.get(resolution, _Rollup(len(self.measures)))
+        return rollup.to_frame(self.measures)
+
+    def rollup_matrix(self, resolution, scopes=('site', 'state', 'national')):
+        """
+        Every materialized rollup of the given scopes as one aligned array
+
+        Returns (scope, name) keys, the shared period labels and an int64 array
+        shaped (series, periods, measures); periods a series has no data for are 0.
+        """
+        if resolution not in ROLLUP_RESOLUTIONS:
+            raise ValueError(f"Unknown rollup resolution: {resolution}")
+        keys, rollups = [], []
+        for scope in scopes:
+            for name, by_resolution in self._rollups[scope].items():
+                if resolution in by_resolution:
+                    keys.append((scope, name))
+                    rollups.append(by_resolution[resolution])
+
+        labels = np.unique(np.concatenate(
+            [rollup.labels for rollup in rollups] or [np.array([], dtype='datetime64[D]')]
+        ))
+        values = np.zeros((len(rollups), len(labels), len(self.measures)), dtype='int64')
+        for row, rollup in enumerate(rollups):
+            values[row, np.searchsorted(labels, rollup.labels)] = rollup.values
+        return keys, pd.DatetimeIndex(labels, name='period'), values
+
+    def daily(self, start, end, site=None, state=None):
+        """Raw daily values summed over the selected sites between start and end inclusive"""
+        start = pd.Timestamp(start).normalize()
+        end = pd.Timestamp(end).normalize()
+        days = pd.date_range(start, end, freq='D', name='period')
+        totals = {measure: np.zeros(len(days), dtype='int64') for measure in self.measures}
+
+        for series in self._sites.values():
+            if site is not None and series.site != site:
+                continue
+            if state is not None and series.state != state:
+                continue
+            lo = max((start - series.start).days, 0)
+            hi = min((end - series.start).days + 1, series.length)
+            if hi <= lo:
+                continue
+            at = (series.start - start).days + lo
+            for measure in self.measures:
+                totals[measure][at:at + hi - lo] += series.columns[measure].view(lo, hi)
+
+        return pd.DataFrame(totals, index=days)
+
+    def query(self, start, end, site=None, state=None, resolution=None, max_points=120):
+        """
+        Read a window at the finest resolution that keeps it under max_points
+
+        Returns the chosen resolution and a frame indexed by period start.
+        """
+        start = pd.Timestamp(start).normalize()
+        end = pd.Timestamp(end).normalize()
+        if resolution is None:
+            resolution = pick_resolution(start, end, max_points)
+        if resolution == 'day':
+            return resolution, self.daily(start, end, site=site, state=state)
+
+        frame = self.rollup(resolution, site=site, state=state)
+        first_label = _period_starts(np.array([np.datetime64(start.date(), 'D')]), resolution)[0]
+        return resolution, frame[(frame.index >= first_label) & (frame.index <= end)]
+
+
+def pick_resolution(start, end, max_points=120):
+    """Finest resolution at which the window between start and end fits in max_points"""
+    span_days = (pd.Timestamp(end) - pd.Timestamp(start)).days + 1
+    for resolution, days in RESOLUTION_DAYS.items():
+        if span_days / days <= max_points:
+            return resolution
+    return 'year'